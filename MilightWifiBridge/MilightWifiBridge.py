@@ -35,9 +35,32 @@ __status__ = "Usable for any project"
 
 import socket
 import collections
+import os
 import sys, getopt
 import logging
 import binascii
+import struct
+
+# Logger of the library (messages are formatted only if they are emitted)
+_log = logging.getLogger(__name__)
+
+# Python 2.7/3 compatibility (monotonic clock)
+try:
+  from time import monotonic as _monotonic
+except ImportError:
+  from time import time as _monotonic
+
+# Python 2.7/3 compatibility (string interning)
+try:
+  from sys import intern as _intern
+except ImportError:
+  _intern = intern
+
+# Python 2.7/3 compatibility (enums are plain classes of int constants if enum module is not available)
+try:
+  from enum import IntEnum as _IntEnum
+except ImportError:
+  _IntEnum = object
 
 class MilightWifiBridge:
   """Milight 3.0 Wifi Bridge class
@@ -45,14 +68,14 @@ class MilightWifiBridge:
   Calling setup() function is necessary in order to make this class work properly.
   """
   ######################### Enums #########################
-  class eZone:
+  class eZone(_IntEnum):
     ALL = 0
     ONE = 1
     TWO = 2
     THREE = 3
     FOUR = 4
 
-  class eDiscoMode:
+  class eDiscoMode(_IntEnum):
     DISCO_1 = 1
     DISCO_2 = 2
     DISCO_3 = 3
@@ -63,14 +86,14 @@ class MilightWifiBridge:
     DISCO_8 = 8
     DISCO_9 = 9
 
-  class eTemperature:
+  class eTemperature(_IntEnum):
     WARM = 0 # 2700K
     WARM_WHITE =  8 # 3000K
     COOL_WHITE = 35 # 4000K
     DAYLIGHT = 61 # 5000K
     COOL_DAYLIGHT = 100 # 6500K
 
-  class eColor:
+  class eColor(_IntEnum):
     RED = 0xFF
     LAVENDER = 0xD9
     BLUE = 0xBA
@@ -81,8 +104,8 @@ class MilightWifiBridge:
     ORANGE = 0x1E
 
   ######################### static variables/static functions/internal struct #########################
-  __START_SESSION_MSG = bytearray([0x20, 0x00, 0x00, 0x00, 0x16, 0x02, 0x62, 0x3A, 0xD5, 0xED, 0xA3, 0x01, 0xAE, 0x08,
-                               0x2D, 0x46, 0x61, 0x41, 0xA7, 0xF6, 0xDC, 0xAF, 0xD3, 0xE6, 0x00, 0x00, 0x1E])
+  __START_SESSION_MSG = bytes(bytearray([0x20, 0x00, 0x00, 0x00, 0x16, 0x02, 0x62, 0x3A, 0xD5, 0xED, 0xA3, 0x01, 0xAE, 0x08,
+                                         0x2D, 0x46, 0x61, 0x41, 0xA7, 0xF6, 0xDC, 0xAF, 0xD3, 0xE6, 0x00, 0x00, 0x1E]))
 
   # Response sent by the milight wifi bridge after a start session query
   # Keyword arguments:
@@ -93,20 +116,72 @@ class MilightWifiBridge:
   #   sequenceNumber -- (int) Sequence number
   __START_SESSION_RESPONSE = collections.namedtuple("StartSessionResponse", "responseReceived mac sessionId1 sessionId2")
 
-  __ON_CMD = bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x01, 0x00, 0x00, 0x00])
-  __OFF_CMD = bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x02, 0x00, 0x00, 0x00])
-  __NIGHT_MODE_CMD = bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x05, 0x00, 0x00, 0x00])
-  __WHITE_MODE_CMD = bytearray([0x31, 0x00, 0x00, 0x08, 0x05, 0x64, 0x00, 0x00, 0x00])
-  __DISCO_MODE_SPEED_UP_CMD = bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x03, 0x00, 0x00, 0x00])
-  __DISCO_MODE_SLOW_DOWN_CMD = bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x04, 0x00, 0x00, 0x00])
-  __LINK_CMD = bytearray([0x3D, 0x00, 0x00, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00])
-  __UNLINK_CMD = bytearray([0x3E, 0x00, 0x00, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00])
-
-  __WIFI_BRIDGE_LAMP_ON_CMD = bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x03, 0x00, 0x00, 0x00])
-  __WIFI_BRIDGE_LAMP_OFF_CMD = bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x04, 0x00, 0x00, 0x00])
-  __WIFI_BRIDGE_LAMP_WHITE_MODE_CMD = bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x05, 0x00, 0x00, 0x00])
-  __WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD = bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x02, 0x00, 0x00, 0x00])
-  __WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD = bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x01, 0x00, 0x00, 0x00])
+  __ON_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x01, 0x00, 0x00, 0x00]))
+  __OFF_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x02, 0x00, 0x00, 0x00]))
+  __NIGHT_MODE_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x05, 0x00, 0x00, 0x00]))
+  __WHITE_MODE_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x05, 0x64, 0x00, 0x00, 0x00]))
+  __DISCO_MODE_SPEED_UP_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x03, 0x00, 0x00, 0x00]))
+  __DISCO_MODE_SLOW_DOWN_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x04, 0x04, 0x00, 0x00, 0x00]))
+  __LINK_CMD = bytes(bytearray([0x3D, 0x00, 0x00, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00]))
+  __UNLINK_CMD = bytes(bytearray([0x3E, 0x00, 0x00, 0x08, 0x00, 0x00, 0x00, 0x00, 0x00]))
+
+  __WIFI_BRIDGE_LAMP_ON_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x03, 0x00, 0x00, 0x00]))
+  __WIFI_BRIDGE_LAMP_OFF_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x04, 0x00, 0x00, 0x00]))
+  __WIFI_BRIDGE_LAMP_WHITE_MODE_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x05, 0x00, 0x00, 0x00]))
+  __WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x02, 0x00, 0x00, 0x00]))
+  __WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x03, 0x01, 0x00, 0x00, 0x00]))
+
+  # Immutable prefixes of the commands containing a variable value (value bytes are appended at each request)
+  __SET_BRIDGE_LAMP_COLOR_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x01]))
+  __SET_COLOR_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x01]))
+  __SET_DISCO_MODE_FOR_BRIDGE_LAMP_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x04]))
+  __SET_DISCO_MODE_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x06]))
+  __SET_BRIGHTNESS_FOR_BRIDGE_LAMP_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x00, 0x02]))
+  __SET_BRIGHTNESS_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x03]))
+  __SET_SATURATION_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x02]))
+  __SET_TEMPERATURE_CMD_PREFIX = bytes(bytearray([0x31, 0x00, 0x00, 0x08, 0x05]))
+
+  # Sum of the bytes of each command (or command prefix), used to calculate request checksum in constant time
+  __ON_CMD_SUM = sum(bytearray(__ON_CMD))
+  __OFF_CMD_SUM = sum(bytearray(__OFF_CMD))
+  __NIGHT_MODE_CMD_SUM = sum(bytearray(__NIGHT_MODE_CMD))
+  __WHITE_MODE_CMD_SUM = sum(bytearray(__WHITE_MODE_CMD))
+  __DISCO_MODE_SPEED_UP_CMD_SUM = sum(bytearray(__DISCO_MODE_SPEED_UP_CMD))
+  __DISCO_MODE_SLOW_DOWN_CMD_SUM = sum(bytearray(__DISCO_MODE_SLOW_DOWN_CMD))
+  __LINK_CMD_SUM = sum(bytearray(__LINK_CMD))
+  __UNLINK_CMD_SUM = sum(bytearray(__UNLINK_CMD))
+  __WIFI_BRIDGE_LAMP_ON_CMD_SUM = sum(bytearray(__WIFI_BRIDGE_LAMP_ON_CMD))
+  __WIFI_BRIDGE_LAMP_OFF_CMD_SUM = sum(bytearray(__WIFI_BRIDGE_LAMP_OFF_CMD))
+  __WIFI_BRIDGE_LAMP_WHITE_MODE_CMD_SUM = sum(bytearray(__WIFI_BRIDGE_LAMP_WHITE_MODE_CMD))
+  __WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD_SUM = sum(bytearray(__WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD))
+  __WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD_SUM = sum(bytearray(__WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD))
+  __SET_BRIDGE_LAMP_COLOR_CMD_PREFIX_SUM = sum(bytearray(__SET_BRIDGE_LAMP_COLOR_CMD_PREFIX))
+  __SET_COLOR_CMD_PREFIX_SUM = sum(bytearray(__SET_COLOR_CMD_PREFIX))
+  __SET_DISCO_MODE_FOR_BRIDGE_LAMP_CMD_PREFIX_SUM = sum(bytearray(__SET_DISCO_MODE_FOR_BRIDGE_LAMP_CMD_PREFIX))
+  __SET_DISCO_MODE_CMD_PREFIX_SUM = sum(bytearray(__SET_DISCO_MODE_CMD_PREFIX))
+  __SET_BRIGHTNESS_FOR_BRIDGE_LAMP_CMD_PREFIX_SUM = sum(bytearray(__SET_BRIGHTNESS_FOR_BRIDGE_LAMP_CMD_PREFIX))
+  __SET_BRIGHTNESS_CMD_PREFIX_SUM = sum(bytearray(__SET_BRIGHTNESS_CMD_PREFIX))
+  __SET_SATURATION_CMD_PREFIX_SUM = sum(bytearray(__SET_SATURATION_CMD_PREFIX))
+  __SET_TEMPERATURE_CMD_PREFIX_SUM = sum(bytearray(__SET_TEMPERATURE_CMD_PREFIX))
+
+  # Request frame: header (0x80 0x00 0x00 0x00 0x11, session ID 1, session ID 2, 0x00, sequence number, 0x00)
+  #                followed by the request tail (command (9 bytes), zone ID, 0x00, checksum)
+  __REQUEST_HEADER = struct.Struct(">BBBBBBBBBB")
+  __REQUEST_TAIL = struct.Struct(">9sBBB")
+
+  # Commands changing the state relatively to the current one (applied twice if sent again): never sent again
+  __NOT_RESENT_CMDS = frozenset((__LINK_CMD, __UNLINK_CMD, __DISCO_MODE_SPEED_UP_CMD, __DISCO_MODE_SLOW_DOWN_CMD,
+                                 __WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, __WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD))
+
+  # Maximum number of requests sent in one burst (sequence numbers 0x01 to 0xFF identify the requests of a burst)
+  __MAX_REQUESTS_PER_BURST = 0xFF
+
+  # Request tails already built: (command, zone ID) => request tail (only depends on command and zone ID)
+  __REQUEST_TAILS = {}
+
+  # Start session response: 7 ignored bytes, MAC address (6 bytes), 6 ignored bytes,
+  #                         session ID 1, session ID 2, 1 ignored byte
+  __START_SESSION_RESPONSE_FRAME = struct.Struct(">7x6s6xBBx")
 
   @staticmethod
   def __getSetBridgeLampColorCmd(color):
@@ -117,18 +192,13 @@ class MilightWifiBridge:
                      examples: 0xFF = Red, 0xD9 = Lavender, 0xBA = Blue, 0x85 = Aqua,
                                0x7A = Green, 0x54 = Lime, 0x3B = Yellow, 0x1E = Orange
 
-    return: (bytearray) 'Set colo for bridge lamp' command
+    return: (tuple) 'Set color for bridge lamp' command (bytes) and sum of its bytes (int)
     """
     color = int(color)
+    color = 0 if color < 0 else (0xFF if color > 0xFF else color)
 
-    if color < 0:
-      color = 0
-    elif color > 0xFF:
-      color = 0xFF
-
-    color &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x00, 0x01, color, color, color, color])
+    return (MilightWifiBridge.__SET_BRIDGE_LAMP_COLOR_CMD_PREFIX + bytes(bytearray([color, color, color, color])),
+            MilightWifiBridge.__SET_BRIDGE_LAMP_COLOR_CMD_PREFIX_SUM + 4*color)
 
   @staticmethod
   def __getSetColorCmd(color):
@@ -139,18 +209,13 @@ class MilightWifiBridge:
                      examples: 0xFF = Red, 0xD9 = Lavender, 0xBA = Blue, 0x85 = Aqua,
                                0x7A = Green, 0x54 = Lime, 0x3B = Yellow, 0x1E = Orange
 
-    return: (bytearray) 'Set color' command
+    return: (tuple) 'Set color' command (bytes) and sum of its bytes (int)
     """
     color = int(color)
+    color = 0 if color < 0 else (0xFF if color > 0xFF else color)
 
-    if color < 0:
-      color = 0
-    elif color > 0xFF:
-      color = 0xFF
-
-    color &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x08, 0x01, color, color, color, color])
+    return (MilightWifiBridge.__SET_COLOR_CMD_PREFIX + bytes(bytearray([color, color, color, color])),
+            MilightWifiBridge.__SET_COLOR_CMD_PREFIX_SUM + 4*color)
 
   @staticmethod
   def __getSetDiscoModeForBridgeLampCmd(mode):
@@ -159,18 +224,13 @@ class MilightWifiBridge:
     Keyword arguments:
       mode -- (int) Disco mode between 1 and 9
 
-    return: (bytearray) 'Set disco mode for bridge lamp' command
+    return: (tuple) 'Set disco mode for bridge lamp' command (bytes) and sum of its bytes (int)
     """
     mode = int(mode)
+    mode = 1 if mode < 1 else (9 if mode > 9 else mode)
 
-    if mode < 1:
-      mode = 1
-    elif mode > 9:
-      mode = 9
-
-    mode &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x00, 0x04, mode, 0x00, 0x00, 0x00])
+    return (MilightWifiBridge.__SET_DISCO_MODE_FOR_BRIDGE_LAMP_CMD_PREFIX + bytes(bytearray([mode, 0x00, 0x00, 0x00])),
+            MilightWifiBridge.__SET_DISCO_MODE_FOR_BRIDGE_LAMP_CMD_PREFIX_SUM + mode)
 
   @staticmethod
   def __getSetDiscoModeCmd(mode):
@@ -179,18 +239,13 @@ class MilightWifiBridge:
     Keyword arguments:
       mode -- (int) Disco mode between 1 and 9
 
-    return: (bytearray) 'Set disco mode' command
+    return: (tuple) 'Set disco mode' command (bytes) and sum of its bytes (int)
     """
     mode = int(mode)
+    mode = 1 if mode < 1 else (9 if mode > 9 else mode)
 
-    if mode < 1:
-      mode = 1
-    elif mode > 9:
-      mode = 9
-
-    mode &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x08, 0x06, mode, 0x00, 0x00, 0x00])
+    return (MilightWifiBridge.__SET_DISCO_MODE_CMD_PREFIX + bytes(bytearray([mode, 0x00, 0x00, 0x00])),
+            MilightWifiBridge.__SET_DISCO_MODE_CMD_PREFIX_SUM + mode)
 
   @staticmethod
   def __getSetBrightnessForBridgeLampCmd(brightness):
@@ -199,18 +254,13 @@ class MilightWifiBridge:
     Keyword arguments:
       brightness -- (int) Brightness percentage between 0 and 100
 
-    return: (bytearray) 'Set brightness for bridge lamp' command
+    return: (tuple) 'Set brightness for bridge lamp' command (bytes) and sum of its bytes (int)
     """
     brightness = int(brightness)
+    brightness = 0 if brightness < 0 else (100 if brightness > 100 else brightness)
 
-    if brightness < 0:
-      brightness = 0
-    elif brightness > 100:
-      brightness = 100
-
-    brightness &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x00, 0x02, brightness, 0x00, 0x00, 0x00])
+    return (MilightWifiBridge.__SET_BRIGHTNESS_FOR_BRIDGE_LAMP_CMD_PREFIX + bytes(bytearray([brightness, 0x00, 0x00, 0x00])),
+            MilightWifiBridge.__SET_BRIGHTNESS_FOR_BRIDGE_LAMP_CMD_PREFIX_SUM + brightness)
 
   @staticmethod
   def __getSetBrightnessCmd(brightness):
@@ -219,18 +269,13 @@ class MilightWifiBridge:
     Keyword arguments:
       brightness -- (int) Brightness percentage between 0 and 100
 
-    return: (bytearray) 'Set brightness' command
+    return: (tuple) 'Set brightness' command (bytes) and sum of its bytes (int)
     """
     brightness = int(brightness)
+    brightness = 0 if brightness < 0 else (100 if brightness > 100 else brightness)
 
-    if brightness < 0:
-      brightness = 0
-    elif brightness > 100:
-      brightness = 100
-
-    brightness &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x08, 0x03, brightness, 0x00, 0x00, 0x00])
+    return (MilightWifiBridge.__SET_BRIGHTNESS_CMD_PREFIX + bytes(bytearray([brightness, 0x00, 0x00, 0x00])),
+            MilightWifiBridge.__SET_BRIGHTNESS_CMD_PREFIX_SUM + brightness)
 
   @staticmethod
   def __getSetSaturationCmd(saturation):
@@ -239,18 +284,13 @@ class MilightWifiBridge:
     Keyword arguments:
       saturation -- (int) Saturation percentage between 0 and 100
 
-    return: (bytearray) 'Set saturation' command
+    return: (tuple) 'Set saturation' command (bytes) and sum of its bytes (int)
     """
     saturation = int(saturation)
+    saturation = 0 if saturation < 0 else (100 if saturation > 100 else saturation)
 
-    if saturation < 0:
-      saturation = 0
-    elif saturation > 100:
-      saturation = 100
-
-    saturation &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x08, 0x02, saturation, 0x00, 0x00, 0x00])
+    return (MilightWifiBridge.__SET_SATURATION_CMD_PREFIX + bytes(bytearray([saturation, 0x00, 0x00, 0x00])),
+            MilightWifiBridge.__SET_SATURATION_CMD_PREFIX_SUM + saturation)
 
   @staticmethod
   def __getSetTemperatureCmd(temperature):
@@ -261,48 +301,95 @@ class MilightWifiBridge:
                            0% <=> Warm white (2700K)
                            100% <=> Cool white (6500K)
 
-    return: (bytearray) 'Set temperature' command
+    return: (tuple) 'Set temperature' command (bytes) and sum of its bytes (int)
     """
     temperature = int(temperature)
+    temperature = 0 if temperature < 0 else (100 if temperature > 100 else temperature)
 
-    if temperature < 0:
-      temperature = 0
-    elif temperature > 100:
-      temperature = 100
-
-    temperature &= 0xFF
-
-    return bytearray([0x31, 0x00, 0x00, 0x08, 0x05, temperature, 0x00, 0x00, 0x00])
+    return (MilightWifiBridge.__SET_TEMPERATURE_CMD_PREFIX + bytes(bytearray([temperature, 0x00, 0x00, 0x00])),
+            MilightWifiBridge.__SET_TEMPERATURE_CMD_PREFIX_SUM + temperature)
 
   @staticmethod
-  def __calculateCheckSum(command, zoneId):
+  def __calculateCheckSum(commandSum, zoneId):
     """Calculate request checksum
 
     Note: Request checksum is equal to SUM(all command bytes and of the zone number) & 0xFF
 
     Keyword arguments:
-      command -- (bytearray) Command
+      commandSum -- (int) Sum of all command bytes
       zoneId -- (int) Zone ID
 
     return: (int) Request checksum
     """
-    checkSum = 0
-    for byteCommand in command:
-      checkSum += byteCommand
-    checkSum += zoneId
+    return (commandSum + zoneId) & 0xFF
 
-    return (checkSum & 0xFF)
+  @staticmethod
+  def __getRequestTail(command, commandSum, zoneId):
+    """Give the end of a request frame (built once per command and zone, then reused)
+
+    Keyword arguments:
+      command -- (bytes) 9 bytes command
+      commandSum -- (int) Sum of all command bytes
+      zoneId -- (int) Zone ID
+
+    return: (bytes) Command, zone ID, 0x00 and checksum
+    """
+    key = (command, zoneId)
+    tail = MilightWifiBridge.__REQUEST_TAILS.get(key)
+    if tail is None:
+      tail = MilightWifiBridge.__REQUEST_TAIL.pack(command, zoneId, 0x00,
+                                                   MilightWifiBridge.__calculateCheckSum(commandSum, zoneId))
+      MilightWifiBridge.__REQUEST_TAILS[key] = tail
+
+    return tail
 
   @staticmethod
-  def __getStringFromUnicode(value):
+  def __getMacAddressFromBytes(macBytes):
+    """Give MAC address string from its bytes
+
+    Keyword arguments:
+      macBytes -- (bytes) MAC address (6 bytes)
+
+    return: (string) MAC address (lowercase and zero-padded hexadecimal values separated by ':')
+    """
     try:
-      return ord(value)
-    except Exception:
-      return value
+      return macBytes.hex(":")
+    # Python < 3.8 (no separator support or no bytes.hex function)
+    except (AttributeError, TypeError):
+      return ":".join("{:02x}".format(byte) for byte in bytearray(macBytes))
+
+  # Requests available in a batch: public function name => function giving command, sum of all command bytes
+  # and zone ID from the public function arguments
+  __BATCH_REQUESTS = {
+    "link": lambda zoneId: (MilightWifiBridge.__LINK_CMD, MilightWifiBridge.__LINK_CMD_SUM, zoneId),
+    "unlink": lambda zoneId: (MilightWifiBridge.__UNLINK_CMD, MilightWifiBridge.__UNLINK_CMD_SUM, zoneId),
+    "turnOn": lambda zoneId: (MilightWifiBridge.__ON_CMD, MilightWifiBridge.__ON_CMD_SUM, zoneId),
+    "turnOff": lambda zoneId: (MilightWifiBridge.__OFF_CMD, MilightWifiBridge.__OFF_CMD_SUM, zoneId),
+    "turnOnWifiBridgeLamp": lambda: (MilightWifiBridge.__WIFI_BRIDGE_LAMP_ON_CMD, MilightWifiBridge.__WIFI_BRIDGE_LAMP_ON_CMD_SUM, 0x01),
+    "turnOffWifiBridgeLamp": lambda: (MilightWifiBridge.__WIFI_BRIDGE_LAMP_OFF_CMD, MilightWifiBridge.__WIFI_BRIDGE_LAMP_OFF_CMD_SUM, 0x01),
+    "setNightMode": lambda zoneId: (MilightWifiBridge.__NIGHT_MODE_CMD, MilightWifiBridge.__NIGHT_MODE_CMD_SUM, zoneId),
+    "setWhiteMode": lambda zoneId: (MilightWifiBridge.__WHITE_MODE_CMD, MilightWifiBridge.__WHITE_MODE_CMD_SUM, zoneId),
+    "setWhiteModeBridgeLamp": lambda: (MilightWifiBridge.__WIFI_BRIDGE_LAMP_WHITE_MODE_CMD, MilightWifiBridge.__WIFI_BRIDGE_LAMP_WHITE_MODE_CMD_SUM, 0x01),
+    "setDiscoMode": lambda discoMode, zoneId: MilightWifiBridge.__getSetDiscoModeCmd(discoMode) + (zoneId,),
+    "setDiscoModeBridgeLamp": lambda discoMode: MilightWifiBridge.__getSetDiscoModeForBridgeLampCmd(discoMode) + (0x01,),
+    "speedUpDiscoMode": lambda zoneId: (MilightWifiBridge.__DISCO_MODE_SPEED_UP_CMD, MilightWifiBridge.__DISCO_MODE_SPEED_UP_CMD_SUM, zoneId),
+    "speedUpDiscoModeBridgeLamp": lambda: (MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD_SUM, 0x01),
+    "slowDownDiscoMode": lambda zoneId: (MilightWifiBridge.__DISCO_MODE_SLOW_DOWN_CMD, MilightWifiBridge.__DISCO_MODE_SLOW_DOWN_CMD_SUM, zoneId),
+    "slowDownDiscoModeBridgeLamp": lambda: (MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD, MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD_SUM, 0x01),
+    "setColor": lambda color, zoneId: MilightWifiBridge.__getSetColorCmd(color) + (zoneId,),
+    "setColorBridgeLamp": lambda color: MilightWifiBridge.__getSetBridgeLampColorCmd(color) + (0x01,),
+    "setBrightness": lambda brightness, zoneId: MilightWifiBridge.__getSetBrightnessCmd(brightness) + (zoneId,),
+    "setBrightnessBridgeLamp": lambda brightness: MilightWifiBridge.__getSetBrightnessForBridgeLampCmd(brightness) + (0x01,),
+    "setSaturation": lambda saturation, zoneId: MilightWifiBridge.__getSetSaturationCmd(saturation) + (zoneId,),
+    "setTemperature": lambda temperature, zoneId: MilightWifiBridge.__getSetTemperatureCmd(temperature) + (zoneId,),
+  }
 
   ################################### INIT ####################################
   def __init__(self):
     """Class must be initialized with setup()"""
+    # Receive buffer reused for every start session response and ACK (no allocation when receiving)
+    self.__recv_buffer = bytearray(1024)
+    self.__sock = None
     self.close()
 
 
@@ -311,44 +398,74 @@ class MilightWifiBridge:
     """Close connection with Milight wifi bridge"""
     self.__initialized = False
     self.__sequence_number = 0
-
-    try:
-      self.__sock.shutdown(socket.SHUT_RDWR)
-      self.__sock.close()
-      logging.debug("Socket closed")
-    # If close before initialization, better handle attribute error
-    except AttributeError:
-      pass
-
-  def setup(self, ip, port=5987, timeout_sec=5.0):
+    self.__invalidateSession()
+
+    # Nothing to close if no socket was created (close before initialization)
+    if self.__sock is not None:
+      try:
+        self.__sock.shutdown(socket.SHUT_RDWR)
+      # Shutdown of an UDP socket may fail on some platforms (the socket still needs to be closed)
+      except socket.error:
+        pass
+      try:
+        self.__sock.close()
+        _log.debug("Socket closed")
+      except socket.error as err:
+        _log.debug("Impossible to close the socket: %s", err)
+      self.__sock = None
+
+  def setup(self, ip, port=5987, timeout_sec=5.0, session_ttl_sec=30.0, retries=3, retry_timeout_sec=0.25):
     """Initialize the class (can be launched multiple time if setup changed or module crashed)
 
     Keyword arguments:
       ip -- (string) IP to communication with the Milight wifi bridge
       port -- (int, optional) UDP port to communication with the Milight wifi bridge
-      timeout_sec -- (int, optional) Timeout in sec for Milight wifi bridge to answer commands
+      timeout_sec -- (int, optional) Maximum timeout in sec for Milight wifi bridge to answer commands
+                                     (total of all the attempts of a start session or of a burst of requests)
+      session_ttl_sec -- (float, optional) Time in sec a start session response is reused for next requests
+                                           (0 to start a new session before each request)
+      retries -- (int, optional) Number of times an unanswered frame is sent again (0 to send it only once),
+                                 link, unlink and disco mode speed up/slow down requests are never sent again
+                                 (applied twice by the wifi bridge if only their response was lost)
+      retry_timeout_sec -- (float, optional) Timeout in sec of the first attempt if retries are enabled
+                                             (doubled at each new attempt, last attempt waiting for the rest
+                                             of timeout_sec)
 
     return: (bool) Milight wifi bridge initialized
     """
     # Close potential previous Milight wifi bridge session
     self.close()
+    self.__session_ttl_sec = session_ttl_sec
+    self.__attempt_timeouts = MilightWifiBridge.__getAttemptTimeouts(timeout_sec, max(0, retries), retry_timeout_sec)
 
     # Create new milight wifi bridge session
     try:
       self.__sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM) # UDP
+      self.__setLowLatencySocketOptions()
       self.__ip = ip
       self.__port = port
       self.__sock.connect((self.__ip, self.__port))
       self.__sock.settimeout(timeout_sec)
       self.__initialized = True
-      logging.debug("UDP connection initialized with ip {} and port {}".format(str(ip), str(port)))
+      _log.debug("UDP connection initialized with ip %s and port %s", ip, port)
     except (socket.error, socket.herror, socket.gaierror, socket.timeout) as err:
-      logging.error("Impossible to initialize the UDP connection with ip {} and port {}: {}".format(str(ip), str(port), str(err)))
+      _log.error("Impossible to initialize the UDP connection with ip %s and port %s: %s", ip, port, err)
 
     return self.__initialized
 
 
   ######################### INTERNAL UTILITY FUNCTIONS #########################
+  def __setLowLatencySocketOptions(self):
+    """Tune the UDP socket for small and latency sensitive frames (best effort, depends on the platform)
+
+    The 'low delay' type of service asks the network to favor latency over throughput.
+    Kernel buffers keep their default size: a burst of requests gets back to back ACKs which must all be queued.
+    """
+    try:
+      self.__sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, 0x10) # IPTOS_LOWDELAY
+    except (socket.error, AttributeError) as err:
+      _log.debug("Impossible to set socket option IP_TOS: %s", err)
+
   def __startSession(self):
     """Send start session request and return start session information
 
@@ -357,263 +474,500 @@ class MilightWifiBridge:
     """
     # Send start session request
     data_to_send = MilightWifiBridge.__START_SESSION_MSG
-    logging.debug("Sending frame '{}' to {}:{}".format(str(binascii.hexlify(data_to_send)),
-                                                     str(self.__ip), str(self.__port)))
-    self.__sock.send(data_to_send)
+    if _log.isEnabledFor(logging.DEBUG):
+      _log.debug("Sending frame '%s' to %s:%s", binascii.hexlify(data_to_send), self.__ip, self.__port)
     response = MilightWifiBridge.__START_SESSION_RESPONSE(responseReceived=False, mac="", sessionId1=-1, sessionId2=-1)
 
-    try:
-      # Receive start session response
-      data = self.__sock.recvfrom(1024)[0]
-      if len(data) == 22:
-        # Parse valid start session response
+    # Frames received but never read (ACKs not waited for, late ACKs) must not be taken for the response
+    self.__dropReceivedFrames()
+
+    attempts = len(self.__attempt_timeouts)
+    for attempt, timeout in enumerate(self.__attempt_timeouts):
+      deadline = self.__setAttemptTimeout(timeout)
+
+      try:
+        self.__sock.send(data_to_send)
+
+        # Receive start session response (any other frame is ignored until the end of the attempt)
+        size = self.__sock.recvfrom_into(self.__recv_buffer)[0]
+        while size != MilightWifiBridge.__START_SESSION_RESPONSE_FRAME.size:
+          _log.warning("Invalid start session response size %s", size)
+          self.__setRemainingTimeout(deadline)
+          size = self.__sock.recvfrom_into(self.__recv_buffer)[0]
+
+        # Parse valid start session response (all fields read in place, without slicing the received frame)
+        macBytes, sessionId1, sessionId2 = MilightWifiBridge.__START_SESSION_RESPONSE_FRAME.unpack_from(self.__recv_buffer)
         response = MilightWifiBridge.__START_SESSION_RESPONSE(responseReceived=True,
-                                                              mac=str("{}:{}:{}:{}:{}:{}".format(format(MilightWifiBridge.__getStringFromUnicode(data[7]), 'x'),
-                                                                                                 format(MilightWifiBridge.__getStringFromUnicode(data[8]), 'x'),
-                                                                                                 format(MilightWifiBridge.__getStringFromUnicode(data[9]), 'x'),
-                                                                                                 format(MilightWifiBridge.__getStringFromUnicode(data[10]), 'x'),
-                                                                                                 format(MilightWifiBridge.__getStringFromUnicode(data[11]), 'x'),
-                                                                                                 format(MilightWifiBridge.__getStringFromUnicode(data[12]), 'x'))),
-                                                              sessionId1=int(MilightWifiBridge.__getStringFromUnicode(data[19])),
-                                                              sessionId2=int(MilightWifiBridge.__getStringFromUnicode(data[20])))
-        logging.debug("Start session (mac address: {}, session ID 1: {}, session ID 2: {})"
-                      .format(str(response.mac), str(response.sessionId1), str(response.sessionId2)))
-      else:
-        logging.warning("Invalid start session response size")
-    except socket.timeout:
-      logging.warning("Timed out for start session response")
+                                                              mac=MilightWifiBridge.__getMacAddressFromBytes(macBytes),
+                                                              sessionId1=sessionId1,
+                                                              sessionId2=sessionId2)
+        _log.debug("Start session (mac address: %s, session ID 1: %s, session ID 2: %s)",
+                   response.mac, response.sessionId1, response.sessionId2)
+        break
+      except socket.timeout:
+        _log.warning("Timed out for start session response (attempt %s/%s)", attempt + 1, attempts)
+      except socket.error as err:
+        _log.warning("Socket error during start session (attempt %s/%s): %s", attempt + 1, attempts, err)
 
     return response
 
-  def __sendRequest(self, command, zoneId):
-    """Send command to a specific zone and get response (ACK from the wifi bridge)
+  def __dropReceivedFrames(self):
+    """Read and drop all the frames already received (without waiting for any new frame)"""
+    self.__sock.setblocking(False)
+    try:
+      while True:
+        size = self.__sock.recvfrom_into(self.__recv_buffer)[0]
+        _log.debug("Dropped previously received frame of %s bytes", size)
+    # Nothing left to read (socket.timeout and non-blocking errors are socket errors)
+    except socket.error:
+      pass
+
+  @staticmethod
+  def __getAttemptTimeouts(timeout_sec, retries, retry_timeout_sec):
+    """Give the timeout of each attempt to get a response of the wifi bridge
+
+    Exponential backoff if retries are enabled: the timeout of the first attempt is doubled at each new attempt
+    and the last attempt waits for the rest of the total timeout (no more attempt once it is spent)
 
     Keyword arguments:
-      command -- (bytearray) Command
-      zoneId -- (int) Zone ID
+      timeout_sec -- (float) Total timeout in sec of all the attempts
+      retries -- (int) Number of attempts after the first one
+      retry_timeout_sec -- (float) Timeout in sec of the first attempt if retries are enabled
 
-    return: (bool) Request received by the wifi bridge
+    return: (tuple of float) Timeout in sec of each attempt
+    """
+    timeouts = []
+    remaining = timeout_sec
+    for attempt in range(retries + 1):
+      timeout = remaining if attempt == retries else min(retry_timeout_sec * (2 ** attempt), remaining)
+      if timeout <= 0:
+        break
+      timeouts.append(timeout)
+      remaining -= timeout
+
+    return tuple(timeouts)
+
+  def __setAttemptTimeout(self, timeout):
+    """Set the timeout to wait for a response of the wifi bridge during an attempt
+
+    Keyword arguments:
+      timeout -- (float) Timeout in sec of the attempt
+
+    return: (float) Time (from _monotonic) at which the attempt is over
+    """
+    self.__sock.settimeout(timeout)
+
+    return _monotonic() + timeout
+
+  def __setRemainingTimeout(self, deadline):
+    """Set the timeout to the time left in the current attempt
+
+    Keyword arguments:
+      deadline -- (float) Time (from _monotonic) at which the attempt is over
+
+    raise: socket.timeout if the attempt is already over
+    """
+    remaining = deadline - _monotonic()
+    if remaining <= 0:
+      raise socket.timeout("timed out")
+    self.__sock.settimeout(remaining)
+
+  def __invalidateSession(self):
+    """Forget the cached start session information (next request will start a new session)"""
+    self.__session = MilightWifiBridge.__START_SESSION_RESPONSE(responseReceived=False, mac="", sessionId1=-1, sessionId2=-1)
+    self.__session_expires_at = 0.0
+
+  def __isSessionCached(self):
+    """Check if the cached start session information can still be used
+
+    return: (bool) Cached session is valid
+    """
+    return self.__session.responseReceived and _monotonic() < self.__session_expires_at
+
+  def __getSession(self):
+    """Give start session information (cached one if still valid, else from a new start session request)
+
+    return: (MilightWifiBridge.__START_SESSION_RESPONSE) Start session information containing response received,
+                                                         mac address and session IDs
+    """
+    if not self.__isSessionCached():
+      self.__session = self.__startSession()
+      if self.__session.responseReceived:
+        self.__session_expires_at = _monotonic() + self.__session_ttl_sec
+
+    return self.__session
+
+  def __buildRequestFrames(self, startSessionResponse, requests):
+    """Build request frames (one per request) of a session
+
+    Keyword arguments:
+      startSessionResponse -- (MilightWifiBridge.__START_SESSION_RESPONSE) Session to use
+      requests -- (list of tuple) Requests to send (command, sum of all command bytes and zone ID)
+
+    return: (tuple) Index of each request by sequence number (dict) and request frames (list of bytes)
+    """
+    pack = MilightWifiBridge.__REQUEST_HEADER.pack
+    getRequestTail = MilightWifiBridge.__getRequestTail
+    sessionId1 = startSessionResponse.sessionId1
+    sessionId2 = startSessionResponse.sessionId2
+    sequenceNumber = self.__sequence_number
+
+    sequenceNumbers = {}
+    frames = []
+    for index, (command, commandSum, zoneId) in enumerate(requests):
+      # For each request, increment the sequence number (even if the session ID is regenerated)
+      # Sequence number must be between 0x01 and 0xFF
+      sequenceNumber = (sequenceNumber + 1) & 0xFF
+      if sequenceNumber == 0:
+        sequenceNumber = 1
+      sequenceNumbers[sequenceNumber] = index
+
+      frames.append(pack(0x80, 0x00, 0x00, 0x00, 0x11, sessionId1, sessionId2, 0x00, sequenceNumber, 0x00)
+                    + getRequestTail(command, commandSum, zoneId))
+      if _log.isEnabledFor(logging.DEBUG):
+        _log.debug("Sending request with command '%s' with session ID 1 '%s', session ID 2 '%s' and sequence number '%s'",
+                   binascii.hexlify(command), sessionId1, sessionId2, sequenceNumber)
+
+    self.__sequence_number = sequenceNumber
+
+    return sequenceNumbers, frames
+
+  def __sendCommands(self, requests, waitAck=True):
+    """Send commands using current session and get responses (ACKs from the wifi bridge)
+
+    Note: All commands are sent before waiting for the responses
+          and the cached session is invalidated if any request failed
+          (more than 255 commands are sent in successive bursts of 255 commands at most)
+
+    Keyword arguments:
+      requests -- (list of tuple) Requests to send (command, sum of all command bytes and zone ID)
+      waitAck -- (bool, optional) Wait for the responses (else requests are considered received once sent)
+
+    return: (list of bool) Request received by the wifi bridge (for each request)
     """
-    returnValue = False
-
-    # Send request only if valid parameters
-    if len(bytearray(command)) == 9:
-      if int(zoneId) >= 0 and int(zoneId) <= 4:
-        startSessionResponse = self.__startSession()
-        if startSessionResponse.responseReceived:
-          # For each request, increment the sequence number (even if the session ID is regenerated)
-          # Sequence number must be between 0x01 and 0xFF
-          self.__sequence_number = (self.__sequence_number + 1) & 0xFF
-          if self.__sequence_number == 0:
-            self.__sequence_number = 1
-
-          # Prepare request frame to send
-          bytesToSend = bytearray([0x80, 0x00, 0x00, 0x00, 0x11, startSessionResponse.sessionId1,
-                                   startSessionResponse.sessionId2, 0x00, int(self.__sequence_number), 0x00])
-          bytesToSend += bytearray(command)
-          bytesToSend += bytearray([int(zoneId), 0x00])
-          bytesToSend += bytearray([int(MilightWifiBridge.__calculateCheckSum(bytearray(command), int(zoneId)))])
-
-          # Send request frame
-          logging.debug("Sending request with command '{}' with session ID 1 '{}', session ID 2 '{}' and sequence number '{}'"
-                        .format(str(binascii.hexlify(command)), str(startSessionResponse.sessionId1),
-                                str(startSessionResponse.sessionId2), str(self.__sequence_number)))
-          self.__sock.send(bytesToSend)
-          try:
-            # Receive response frame
-            data = self.__sock.recvfrom(64)[0]
-            if len(data) == 8:
-              if int(MilightWifiBridge.__getStringFromUnicode(data[6])) == self.__sequence_number:
-                returnValue = True
-                logging.debug("Received valid response for previously sent request")
+    burstSize = MilightWifiBridge.__MAX_REQUESTS_PER_BURST
+    if len(requests) > burstSize:
+      acknowledged = []
+      for start in range(0, len(requests), burstSize):
+        acknowledged.extend(self.__sendCommands(requests[start:start + burstSize], waitAck))
+      return acknowledged
+
+    acknowledged = [False] * len(requests)
+
+    startSessionResponse = self.__getSession()
+    if startSessionResponse.responseReceived:
+      sequenceNumbers, frames = self.__buildRequestFrames(startSessionResponse, requests)
+      send = self.__sock.send
+      recvInto = self.__sock.recvfrom_into
+      buffer = self.__recv_buffer
+
+      # Frames received but never read (ACKs not waited for, late ACKs) must not be taken for the responses
+      self.__dropReceivedFrames()
+
+      # Requests not acknowledged yet: sequence number => request index
+      pending = dict(sequenceNumbers)
+      notResentCommands = MilightWifiBridge.__NOT_RESENT_CMDS
+      attempts = len(self.__attempt_timeouts)
+      for attempt, timeout in enumerate(self.__attempt_timeouts):
+        deadline = self.__setAttemptTimeout(timeout)
+
+        try:
+          # Send all pending request frames back-to-back (already built so nothing is computed between 2 sends)
+          # Frames sent again keep their sequence number so that any of their responses acknowledges them
+          # (requests which must not be applied twice are only sent once but their late response is still waited for)
+          for index in sorted(pending.values()):
+            if attempt == 0 or requests[index][0] not in notResentCommands:
+              send(frames[index])
+
+          if not waitAck:
+            return [True] * len(requests)
+
+          # Receive response frames until all pending requests are acknowledged
+          # (unexpected frames are ignored and do not end the attempt before its timeout)
+          while pending:
+            size = recvInto(buffer, 64)[0]
+            if size == 8:
+              sequenceNumber = buffer[6]
+              if sequenceNumber in pending:
+                acknowledged[pending.pop(sequenceNumber)] = True
+                _log.debug("Received valid response for previously sent request")
+              elif sequenceNumber in sequenceNumbers:
+                _log.debug("Received response for already acknowledged request")
               else:
-                logging.warning("Invalid sequence number ack {} instead of {}".format(str(data[6]),
-                                                                                      self.__sequence_number))
+                _log.warning("Invalid sequence number ack %s instead of %s", sequenceNumber, sorted(pending))
             else:
-              logging.warning("Invalid response size {} instead of 8".format(str(len(data))))
-          except socket.timeout:
-            logging.warning("Timed out for response")
+              _log.warning("Invalid response size %s instead of 8", size)
+
+            if pending:
+              self.__setRemainingTimeout(deadline)
+        except socket.timeout:
+          _log.warning("Timed out for response (attempt %s/%s)", attempt + 1, attempts)
+        except socket.error as err:
+          _log.warning("Socket error (attempt %s/%s): %s", attempt + 1, attempts, err)
+
+        if not pending:
+          break
+    else:
+      _log.warning("Start session failed")
+
+    if not all(acknowledged):
+      self.__invalidateSession()
+
+    return acknowledged
+
+  def __sendRequests(self, requests, waitAck=True):
+    """Send commands to specific zones in the same session and get responses (ACKs from the wifi bridge)
+
+    Note: Requests failing with a cached session are sent again once with a new session
+          (except the requests which must not be applied twice)
+
+    Keyword arguments:
+      requests -- (list of tuple) Requests to send (command, sum of all command bytes and zone ID)
+      waitAck -- (bool, optional) Wait for the responses (else requests are considered received once sent)
+
+    return: (list of bool) Request received by the wifi bridge (for each request)
+    """
+    returnValues = [False] * len(requests)
+
+    # Send requests only if valid parameters (zone ID converted once to int for the whole send path)
+    validIndexes = []
+    validRequests = {}
+    for index, (command, commandSum, zoneId) in enumerate(requests):
+      if len(command) == 9:
+        zone = int(zoneId)
+        if 0 <= zone <= 4:
+          validIndexes.append(index)
+          validRequests[index] = (command, commandSum, zone)
         else:
-          logging.warning("Start session failed")
+          _log.error("Invalid zone %s (must be between 0 and 4)", zoneId)
       else:
-        logging.error("Invalid zone {} (must be between 0 and 4)".format(str(zoneId)))
-    else:
-      logging.error("Invalid command size {} instead of 9".format(str(len(bytearray(command)))))
+        _log.error("Invalid command size %s instead of 9", len(command))
 
-    return returnValue
+    if len(validIndexes) > 0:
+      sessionReused = self.__isSessionCached()
+      for index, acknowledged in zip(validIndexes, self.__sendCommands([validRequests[index] for index in validIndexes], waitAck)):
+        returnValues[index] = acknowledged
+
+      notResentCommands = MilightWifiBridge.__NOT_RESENT_CMDS
+      failedIndexes = [index for index in validIndexes
+                       if not returnValues[index] and validRequests[index][0] not in notResentCommands]
+      if sessionReused and len(failedIndexes) > 0:
+        _log.debug("Request failed with cached session, retry with a new session")
+        for index, acknowledged in zip(failedIndexes, self.__sendCommands([validRequests[index] for index in failedIndexes], waitAck)):
+          returnValues[index] = acknowledged
+
+    return returnValues
+
+  def __sendRequest(self, command, zoneId, commandSum, waitAck=True):
+    """Send command to a specific zone and get response (ACK from the wifi bridge)
+
+    Keyword arguments:
+      command -- (bytes) Command
+      zoneId -- (int) Zone ID
+      commandSum -- (int) Sum of all command bytes
+      waitAck -- (bool, optional) Wait for the response (else request is considered received once sent)
+
+    return: (bool) Request received by the wifi bridge
+    """
+    return self.__sendRequests([(command, commandSum, zoneId)], waitAck)[0]
 
 
   ######################### PUBLIC FUNCTIONS #########################
-  def turnOn(self, zoneId):
+  def turnOn(self, zoneId, waitAck=True):
     """Request 'Light on' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__ON_CMD, zoneId)
-    logging.debug("Turn on zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__ON_CMD, zoneId, MilightWifiBridge.__ON_CMD_SUM, waitAck)
+    _log.debug("Turn on zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def turnOff(self, zoneId):
+  def turnOff(self, zoneId, waitAck=True):
     """Request 'Light off' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__OFF_CMD, zoneId)
-    logging.debug("Turn off zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__OFF_CMD, zoneId, MilightWifiBridge.__OFF_CMD_SUM, waitAck)
+    _log.debug("Turn off zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def turnOnWifiBridgeLamp(self):
+  def turnOnWifiBridgeLamp(self, waitAck=True):
     """Request 'Wifi bridge lamp on' to a zone
 
+    Keyword arguments:
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
+
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_ON_CMD, 0x01)
-    logging.debug("Turn on wifi bridge lamp: {}".format(str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_ON_CMD, 0x01, MilightWifiBridge.__WIFI_BRIDGE_LAMP_ON_CMD_SUM, waitAck)
+    _log.debug("Turn on wifi bridge lamp: %s", returnValue)
     return returnValue
 
-  def turnOffWifiBridgeLamp(self):
+  def turnOffWifiBridgeLamp(self, waitAck=True):
     """Request 'Wifi bridge lamp off'
 
+    Keyword arguments:
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
+
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_OFF_CMD, 0x01)
-    logging.debug("Turn off wifi bridge lamp: {}".format(str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_OFF_CMD, 0x01, MilightWifiBridge.__WIFI_BRIDGE_LAMP_OFF_CMD_SUM, waitAck)
+    _log.debug("Turn off wifi bridge lamp: %s", returnValue)
     return returnValue
 
-  def setNightMode(self, zoneId):
+  def setNightMode(self, zoneId, waitAck=True):
     """Request 'Night mode' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__NIGHT_MODE_CMD, zoneId)
-    logging.debug("Set night mode to zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__NIGHT_MODE_CMD, zoneId, MilightWifiBridge.__NIGHT_MODE_CMD_SUM, waitAck)
+    _log.debug("Set night mode to zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def setWhiteMode(self, zoneId):
+  def setWhiteMode(self, zoneId, waitAck=True):
     """Request 'White mode' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__WHITE_MODE_CMD, zoneId)
-    logging.debug("Set white mode to zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__WHITE_MODE_CMD, zoneId, MilightWifiBridge.__WHITE_MODE_CMD_SUM, waitAck)
+    _log.debug("Set white mode to zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def setWhiteModeBridgeLamp(self):
+  def setWhiteModeBridgeLamp(self, waitAck=True):
     """Request 'White mode' to the bridge lamp
 
+    Keyword arguments:
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
+
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_WHITE_MODE_CMD, 0x01)
-    logging.debug("Set white mode to wifi bridge: {}".format(str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_WHITE_MODE_CMD, 0x01, MilightWifiBridge.__WIFI_BRIDGE_LAMP_WHITE_MODE_CMD_SUM, waitAck)
+    _log.debug("Set white mode to wifi bridge: %s", returnValue)
     return returnValue
 
-  def setDiscoMode(self, discoMode, zoneId):
+  def setDiscoMode(self, discoMode, zoneId, waitAck=True):
     """Request 'Set disco mode' to a zone
 
     Keyword arguments:
       discoMode -- (int or MilightWifiBridge.eDiscoMode) Disco mode (9 modes available)
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetDiscoModeCmd(discoMode), zoneId)
-    logging.debug("Set disco mode {} to zone {}: {}".format(str(discoMode), str(zoneId), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetDiscoModeCmd(discoMode)
+    returnValue = self.__sendRequest(command, zoneId, commandSum, waitAck)
+    _log.debug("Set disco mode %s to zone %s: %s", discoMode, zoneId, returnValue)
     return returnValue
 
-  def setDiscoModeBridgeLamp(self, discoMode):
+  def setDiscoModeBridgeLamp(self, discoMode, waitAck=True):
     """Request 'Set disco mode' to the bridge lamp
 
     Keyword arguments:
       discoMode -- (int or MilightWifiBridge.eDiscoMode) Disco mode (9 modes available)
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetDiscoModeForBridgeLampCmd(discoMode), 0x01)
-    logging.debug("Set disco mode {} to wifi bridge: {}".format(str(discoMode), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetDiscoModeForBridgeLampCmd(discoMode)
+    returnValue = self.__sendRequest(command, 0x01, commandSum, waitAck)
+    _log.debug("Set disco mode %s to wifi bridge: %s", discoMode, returnValue)
     return returnValue
 
-  def speedUpDiscoMode(self, zoneId):
+  def speedUpDiscoMode(self, zoneId, waitAck=True):
     """Request 'Disco mode speed up' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__DISCO_MODE_SPEED_UP_CMD, zoneId)
-    logging.debug("Speed up disco mode to zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__DISCO_MODE_SPEED_UP_CMD, zoneId, MilightWifiBridge.__DISCO_MODE_SPEED_UP_CMD_SUM, waitAck)
+    _log.debug("Speed up disco mode to zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def speedUpDiscoModeBridgeLamp(self):
+  def speedUpDiscoModeBridgeLamp(self, waitAck=True):
     """Request 'Disco mode speed up' to the wifi bridge
 
+    Keyword arguments:
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
+
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, 0x01)
-    logging.debug("Speed up disco mode to wifi bridge: {}".format(str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, 0x01, MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD_SUM, waitAck)
+    _log.debug("Speed up disco mode to wifi bridge: %s", returnValue)
     return returnValue
 
-  def slowDownDiscoMode(self, zoneId):
+  def slowDownDiscoMode(self, zoneId, waitAck=True):
     """Request 'Disco mode slow down' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__DISCO_MODE_SLOW_DOWN_CMD, zoneId)
-    logging.debug("Slow down disco mode to zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__DISCO_MODE_SLOW_DOWN_CMD, zoneId, MilightWifiBridge.__DISCO_MODE_SLOW_DOWN_CMD_SUM, waitAck)
+    _log.debug("Slow down disco mode to zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def slowDownDiscoModeBridgeLamp(self):
+  def slowDownDiscoModeBridgeLamp(self, waitAck=True):
     """Request 'Disco mode slow down' to wifi bridge
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD, 0x01)
-    logging.debug("Slow down disco mode to wifi bridge: {}".format(str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD, 0x01, MilightWifiBridge.__WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD_SUM, waitAck)
+    _log.debug("Slow down disco mode to wifi bridge: %s", returnValue)
     return returnValue
 
-  def link(self, zoneId):
+  def link(self, zoneId, waitAck=True):
     """Request 'Link' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__LINK_CMD, zoneId)
-    logging.debug("Link zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__LINK_CMD, zoneId, MilightWifiBridge.__LINK_CMD_SUM, waitAck)
+    _log.debug("Link zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def unlink(self, zoneId):
+  def unlink(self, zoneId, waitAck=True):
     """Request 'Unlink' to a zone
 
     Keyword arguments:
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__UNLINK_CMD, zoneId)
-    logging.debug("Unlink zone {}: {}".format(str(zoneId), str(returnValue)))
+    returnValue = self.__sendRequest(MilightWifiBridge.__UNLINK_CMD, zoneId, MilightWifiBridge.__UNLINK_CMD_SUM, waitAck)
+    _log.debug("Unlink zone %s: %s", zoneId, returnValue)
     return returnValue
 
-  def setColor(self, color, zoneId):
+  def setColor(self, color, zoneId, waitAck=True):
     """Request 'Set color' to a zone
 
     Keyword arguments:
@@ -621,455 +975,438 @@ class MilightWifiBridge:
                      examples: 0xFF = Red, 0xD9 = Lavender, 0xBA = Blue, 0x85 = Aqua,
                                0x7A = Green, 0x54 = Lime, 0x3B = Yellow, 0x1E = Orange
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetColorCmd(color), zoneId)
-    logging.debug("Set color {} to zone {}: {}".format(str(color), str(zoneId), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetColorCmd(color)
+    returnValue = self.__sendRequest(command, zoneId, commandSum, waitAck)
+    _log.debug("Set color %s to zone %s: %s", color, zoneId, returnValue)
     return returnValue
 
-  def setColorBridgeLamp(self, color):
+  def setColorBridgeLamp(self, color, waitAck=True):
     """Request 'Set color' to wifi bridge
 
     Keyword arguments:
       color -- (int or eColor) Color (between 0x00 and 0xFF)
                      examples: 0xFF = Red, 0xD9 = Lavender, 0xBA = Blue, 0x85 = Aqua,
                                0x7A = Green, 0x54 = Lime, 0x3B = Yellow, 0x1E = Orange
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetBridgeLampColorCmd(color), 0x01)
-    logging.debug("Set color {} to wifi bridge: {}".format(str(color), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetBridgeLampColorCmd(color)
+    returnValue = self.__sendRequest(command, 0x01, commandSum, waitAck)
+    _log.debug("Set color %s to wifi bridge: %s", color, returnValue)
     return returnValue
 
-  def setBrightness(self, brightness, zoneId):
+  def setBrightness(self, brightness, zoneId, waitAck=True):
     """Request 'Set brightness' to a zone
 
     Keyword arguments:
       brightness -- (int) Brightness in percentage (between 0 and 100)
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetBrightnessCmd(brightness), zoneId)
-    logging.debug("Set brightness {}% to zone {}: {}".format(str(brightness), str(zoneId), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetBrightnessCmd(brightness)
+    returnValue = self.__sendRequest(command, zoneId, commandSum, waitAck)
+    _log.debug("Set brightness %s%% to zone %s: %s", brightness, zoneId, returnValue)
     return returnValue
 
-  def setBrightnessBridgeLamp(self, brightness):
+  def setBrightnessBridgeLamp(self, brightness, waitAck=True):
     """Request 'Set brightness' to the wifi bridge
 
     Keyword arguments:
       brightness -- (int) Brightness in percentage (between 0 and 100)
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetBrightnessForBridgeLampCmd(brightness), 0x01)
-    logging.debug("Set brightness {}% to the wifi bridge: {}".format(str(brightness), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetBrightnessForBridgeLampCmd(brightness)
+    returnValue = self.__sendRequest(command, 0x01, commandSum, waitAck)
+    _log.debug("Set brightness %s%% to the wifi bridge: %s", brightness, returnValue)
     return returnValue
 
-  def setSaturation(self, saturation, zoneId):
+  def setSaturation(self, saturation, zoneId, waitAck=True):
     """Request 'Set saturation' to a zone
 
     Keyword arguments:
       brightness -- (int) Saturation in percentage (between 0 and 100)
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetSaturationCmd(saturation), zoneId)
-    logging.debug("Set saturation {}% to zone {}: {}".format(str(saturation), str(zoneId), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetSaturationCmd(saturation)
+    returnValue = self.__sendRequest(command, zoneId, commandSum, waitAck)
+    _log.debug("Set saturation %s%% to zone %s: %s", saturation, zoneId, returnValue)
     return returnValue
 
-  def setTemperature(self, temperature, zoneId):
+  def setTemperature(self, temperature, zoneId, waitAck=True):
     """Request 'Set temperature' to a zone
 
     Keyword arguments:
       brightness -- (int or MilightWifiBridge.eTemperature) Temperature in percentage (between 0 and 100)
       zoneId -- (int or MilightWifiBridge.eZone) Zone ID
+      waitAck -- (bool, optional) Wait for the wifi bridge response (else request is considered received once sent)
 
     return: (bool) Request received by the wifi bridge
     """
-    returnValue = self.__sendRequest(MilightWifiBridge.__getSetTemperatureCmd(temperature), zoneId)
-    logging.debug("Set temperature {}% ({} kelvin) to zone {}: {}"
-                  .format(str(temperature), str(int(2700 + 38*temperature)), str(zoneId), str(returnValue)))
+    command, commandSum = MilightWifiBridge.__getSetTemperatureCmd(temperature)
+    returnValue = self.__sendRequest(command, zoneId, commandSum, waitAck)
+    _log.debug("Set temperature %s%% (%s kelvin) to zone %s: %s", temperature, int(2700 + 38*temperature), zoneId, returnValue)
     return returnValue
 
+  def sendBatch(self, requests, waitAck=True):
+    """Send multiple requests in the same session (all requests are sent before waiting for the responses)
+
+    Keyword arguments:
+      requests -- (list of tuple) Requests, each one being a public function name followed by its arguments
+                                  example: [("turnOn", 1), ("setColor", 0xBA, 1), ("setBrightnessBridgeLamp", 50)]
+      waitAck -- (bool, optional) Wait for the wifi bridge responses (else requests are considered received once sent)
+
+    return: (list of bool) Request received by the wifi bridge (for each request)
+    """
+    returnValues = [False] * len(requests)
+
+    validIndexes = []
+    validRequests = []
+    for index, request in enumerate(requests):
+      if request[0] in MilightWifiBridge.__BATCH_REQUESTS:
+        validIndexes.append(index)
+        validRequests.append(MilightWifiBridge.__BATCH_REQUESTS[request[0]](*request[1:]))
+      else:
+        _log.error("Invalid batch request %s", request[0])
+
+    for index, returnValue in zip(validIndexes, self.__sendRequests(validRequests, waitAck)):
+      returnValues[index] = returnValue
+
+    _log.debug("Send batch of %s requests: %s", len(requests), returnValues)
+    return returnValues
+
   def getMacAddress(self):
     """Request the MAC address of the milight wifi bridge
 
     return: (string) MAC address of the wifi bridge (empty if an error occured)
     """
-    returnValue = self.__startSession().mac
-    logging.debug("Get MAC address: {}".format(str(returnValue)))
+    returnValue = self.__getSession().mac
+    _log.debug("Get MAC address: %s", returnValue)
     return returnValue
 
 
 ################################# HELP FUNCTION ################################
-def __help(func="", filename=__file__):
+# Help of a command line function
+# Keyword arguments:
+#   title -- (string) Name of the function shown in the help of all functions
+#   shortOption -- (string) Short option name (without '-')
+#   longOption -- (string) Long option name (without '--')
+#   summary -- (string) Description shown in the help of all functions
+#   description -- (tuple of string) Paragraphs of the description shown in the help of the function
+#   prefix -- (string) Options to use before the function in the usage examples
+#   usage -- (string) Argument of the function in the usage
+#   examples -- (tuple of string) Arguments of the function in the examples (no example section if empty)
+_HelpEntry = collections.namedtuple("_HelpEntry", "title shortOption longOption summary description prefix usage examples")
+
+_IP_PREFIX = "--ip 192.168.1.23 "
+_ZONE_PREFIX = "--ip 192.168.1.23 --zone 1 "
+_LINK_NOTE = "Note: In order to make this work, the light must be switch on manually max 3sec before this command"
+
+# Help of all command line functions (in display order)
+_HELP_ENTRIES = (
+  _HelpEntry("HELP", "h", "help", "Give information to use all or specific milight wifi bridge commands",
+             ("Give information to use all or specific milight wifi bridge commands",),
+             "", " [command (default: none)]", ("", " turnOn")),
+  _HelpEntry("IP", "i", "ip", "Specify milight wifi bridge IP (mandatory to use any command)",
+             ("Specify milight wifi bridge IP (mandatory to use any command)",),
+             "", " [ip]", (" 192.168.1.23",)),
+  _HelpEntry("PORT", "p", "port", "Specify milight wifi bridge port (default value: 5987)",
+             ("Specify milight wifi bridge port", "Default value (if not called): 5987"),
+             "", " [port]", (" 1234",)),
+  _HelpEntry("TIMEOUT", "t", "timeout", "Specify timeout for communication with the wifi bridge in sec (default value: 5.0sec)",
+             ("Specify timeout for communication with the wifi bridge (in sec)",
+              "Total time waiting for each answer of the wifi bridge (unanswered requests sent again meanwhile)",
+              "Default value (if not called): 5.0"),
+             "", " [timeout]", (" 1",)),
+  _HelpEntry("ZONE", "z", "zone", "Specify milight light zone to control (default value: All zone)",
+             ("Specify milight light zone to control", "Default value (if not called): 0",
+              "Possible values: 0 for all zone or zone 1 to 4"),
+             "", " [zone]", (" 1",)),
+  _HelpEntry("GET MAC ADDRESS", "m", "getMacAddress", "Get the milight wifi bridge mac address",
+             ("Get the milight wifi bridge mac address",), _IP_PREFIX, "", ()),
+  _HelpEntry("LINK", "l", "link", "Link lights to a specific zone",
+             ("Link lights to a specific zone", _LINK_NOTE), _ZONE_PREFIX, "", ()),
+  _HelpEntry("UNLINK", "u", "unlink", "Unlink lights",
+             ("Unlink lights", _LINK_NOTE), _IP_PREFIX, "", ()),
+  _HelpEntry("TURN ON", "o", "turnOn", "Turn lights on",
+             ("Turn lights on",), _ZONE_PREFIX, "", ()),
+  _HelpEntry("TURN OFF", "f", "turnOff", "Turn lights off",
+             ("Turn lights off",), _ZONE_PREFIX, "", ()),
+  _HelpEntry("TURN WIFI BRIDGE LAMP ON", "x", "turnOnWifiBridgeLamp", "Turn wifi bridge lamp on",
+             ("Turn wifi bridge lamp on",), _IP_PREFIX, "", ()),
+  _HelpEntry("TURN WIFI BRIDGE LAMP OFF", "y", "turnOffWifiBridgeLamp", "Turn wifi bridge lamp off",
+             ("Turn wifi bridge lamp off",), _IP_PREFIX, "", ()),
+  _HelpEntry("SET NIGHT MODE", "n", "setNightMode", "Set night mode",
+             ("Set night mode",), _ZONE_PREFIX, "", ()),
+  _HelpEntry("SET WHITE MODE", "w", "setWhiteMode", "Set white mode",
+             ("Set white mode",), _ZONE_PREFIX, "", ()),
+  _HelpEntry("SET WHITE MODE ON BRIDGE LAMP", "j", "setWhiteModeBridgeLamp", "Set white mode on bridge lamp",
+             ("Set white mode on bridge lamp",), _IP_PREFIX, "", ()),
+  _HelpEntry("SPEED UP DISCO MODE FOR BRIDGE LAMP", "k", "speedUpDiscoModeBridgeLamp", "Speed up disco mode for bridge lamp",
+             ("Speed up disco mode for bridge lamp",), _IP_PREFIX, "", ()),
+  _HelpEntry("SLOW DOWN DISCO MODE FOR BRIDGE LAMP", "q", "slowDownDiscoModeBridgeLamp", "Slow down disco mode for bridge lamp",
+             ("Slow down disco mode for bridge lamp",), _IP_PREFIX, "", ()),
+  _HelpEntry("SPEED UP DISCO MODE", "a", "speedUpDiscoMode", "Speed up disco mode",
+             ("Speed up disco mode",), _ZONE_PREFIX, "", ()),
+  _HelpEntry("SLOW DOWN DISCO MODE", "g", "slowDownDiscoMode", "Slow down disco mode",
+             ("Slow down disco mode",), _ZONE_PREFIX, "", ()),
+  _HelpEntry("SET COLOR", "c", "setColor", "Set specific color (between 0 and 255)",
+             ("Set specific color (between 0 and 255)",), _ZONE_PREFIX, " 255", ()),
+  _HelpEntry("SET BRIGHTNESS", "b", "setBrightness", "Set brightness (in %)",
+             ("Set brightness (in %)",), _ZONE_PREFIX, " 50", ()),
+  _HelpEntry("SET COLOR FOR THE BRIDGE LAMP", "r", "setColorBridgeLamp", "Set specific color for the bridge lamp (between 0 and 255)",
+             ("Set specific color for the bridge lamp (between 0 and 255)",), _IP_PREFIX, " 255", ()),
+  _HelpEntry("SET BRIGHTNESS FOR THE BRIDGE LAMP", "v", "setBrightnessBridgeLamp", "Set brightness for the bridge lamp (in %)",
+             ("Set brightness for the bridge lamp (in %)",), _IP_PREFIX, " 50", ()),
+  _HelpEntry("SET SATURATION", "s", "setSaturation", "Set saturation (in %)",
+             ("Set saturation (in %)",), _ZONE_PREFIX, " 50", ()),
+  _HelpEntry("SET TEMPERATURE", "e", "setTemperature", "Set temperature (in %)",
+             ("Set temperature (in %)",), _ZONE_PREFIX, " 50", ()),
+  _HelpEntry("SET DISCO MODE", "d", "setDiscoMode", "Set disco mode (between 1 and 9)",
+             ("Set disco mode (between 1 and 9)",), _ZONE_PREFIX, " 5", ()),
+  _HelpEntry("SET DISCO MODE FOR BRIDGE LAMP", "1", "setDiscoModeBridgeLamp", "Set disco mode for bridge lamp (between 1 and 9)",
+             ("Set disco mode for bridge lamp (between 1 and 9)",), _IP_PREFIX, " 5", ()),
+)
+
+# Help entry of each command line function: short option and lower case long option => help entry
+_HELP_INDEX = dict((key, entry) for entry in _HELP_ENTRIES for key in (entry.shortOption, entry.longOption.lower()))
+
+# Use case examples shown at the end of the help of all functions
+_HELP_EXAMPLES = (
+  ("Get the mac address", "--ip 192.168.1.23 --port 5987 --getMacAddress"),
+  ("Set disco mode 5 in light zone 1", "--ip 192.168.1.23 --port 5987 --zone 1 --setDiscoMode 5"),
+  ("Light on zone 1", "--ip 192.168.1.23 --port 5987 --zone 1 --turnOn"),
+  ("Light off zone 1", "--ip 192.168.1.23 --port 5987 --zone 1 --turnOff"),
+  ("Light on and set with light in zone 1", "--ip 192.168.1.23 --port 5987 --zone 1 --turnOn --setWhiteMode"),
+  ("Light on all zone", "--ip 192.168.1.23 --port 5987 --zone 0 --turnOn"),
+  ("Light off all zone", "--ip 192.168.1.23 --port 5987 --zone 0 --turnOff"),
+)
+
+# File name of the python script implementing the commands (shown in the help)
+_FILENAME = os.path.basename(__file__)
+
+# Help already rendered: lower case function => help text
+_HELP_CACHE = {}
+
+def __renderHelp(func):
+  """Give the help text on how to use command line milight wifi bridge functions (rendered once, then cached)
+
+  Keyword arguments:
+    func -- (string) Lower case command line function requiring help, empty string for all functions
+
+  return: (string) Help text
+  """
+  text = _HELP_CACHE.get(func)
+  if text is not None:
+    return text
+
+  # Help of a specific function (single text with paragraphs, usage and examples)
+  if func != "":
+    entry = _HELP_INDEX[func]
+    options = ("-{}".format(entry.shortOption), "--{}".format(entry.longOption))
+    lines = []
+    for paragraph in entry.description:
+      lines.extend((paragraph, ""))
+    lines.append("Usage:")
+    lines.extend("{} {}{}{}".format(_FILENAME, entry.prefix, option, entry.usage) for option in options)
+    if entry.examples:
+      lines.extend(("", "Example:"))
+      lines.extend("{} {}{}{}".format(_FILENAME, entry.prefix, option, example)
+                   for option in options for example in entry.examples)
+    lines.append("")
+    text = "\r\n".join(lines)
+  # Help of all functions followed by use case examples
+  else:
+    lines = ["{} (-{}, --{}): {}".format(entry.title, entry.shortOption, entry.longOption, entry.summary)
+             for entry in _HELP_ENTRIES]
+    lines.append("\r\n".join(["", "Some examples (if ip '192.168.1.23', port is 5987):"]
+                              + [" - {}: {} {}".format(description, _FILENAME, options)
+                                 for description, options in _HELP_EXAMPLES]))
+    text = "\n".join(lines)
+
+  _HELP_CACHE[func] = text
+  return text
+
+def __help(func=""):
   """Show help on how to use command line milight wifi bridge functions
   Keyword arguments:
     func -- (string, optional) Command line function requiring help, none will show all function
-    filename -- (string, optional) File name of the python script implementing the commands
   """
   func = func.lower()
-
-  # Help
-  if func in ("h", "help"):
-    print("Give information to use all or specific milight wifi bridge commands\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" -h [command (default: none)]\r\n"
-          +filename+" --help [command (default: none)]\r\n"
-          +"\r\n"
-          +"Example:\r\n"
-          +filename+" -h \r\n"
-          +filename+" -h turnOn \r\n"
-          +filename+" --help \r\n"
-          +filename+" --help link")
-    return
-  elif func == "":
-    print("HELP (-h, --help): Give information to use all or specific milight wifi bridge commands")
-
-  # Ip
-  if func in ("i", "ip"):
-    print("Specify milight wifi bridge IP (mandatory to use any command)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" -i [ip]\r\n"
-          +filename+" --ip [ip]\r\n"
-          +"\r\n"
-          +"Example:\r\n"
-          +filename+" -i 192.168.1.23\r\n"
-          +filename+" --ip 192.168.1.23\r\n")
-    return
-  elif func == "":
-    print("IP (-i, --ip): Specify milight wifi bridge IP (mandatory to use any command)")
-
-  # Port
-  if func in ("p", "port"):
-    print("Specify milight wifi bridge port\r\n"
-          +"\r\n"
-          +"Default value (if not called): 5987\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" -port [port]\r\n"
-          +filename+" --port [port]\r\n"
-          +"\r\n"
-          +"Example:\r\n"
-          +filename+" -p 1234\r\n"
-          +filename+" --port 1234\r\n")
-    return
-  elif func == "":
-    print("PORT (-p, --port): Specify milight wifi bridge port (default value: 5987)")
-
-  # Timeout
-  if func in ("t", "timeout"):
-    print("Specify timeout for communication with the wifi bridge (in sec)\r\n"
-          +"\r\n"
-          +"Default value (if not called): 5.0\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" -t [timeout]\r\n"
-          +filename+" --timeout [timeout]\r\n"
-          +"\r\n"
-          +"Example:\r\n"
-          +filename+" -t 1\r\n"
-          +filename+" --timeout 1\r\n")
-    return
-  elif func == "":
-    print("TIMEOUT (-t, --timeout): Specify timeout for communication with the wifi bridge in sec (default value: 5.0sec)")
-
-  # Zone
-  if func in ("z", "zone"):
-    print("Specify milight light zone to control\r\n"
-          +"\r\n"
-          +"Default value (if not called): 0\r\n"
-          +"\r\n"
-          +"Possible values: 0 for all zone or zone 1 to 4\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" -z [zone]\r\n"
-          +filename+" --zone [zone]\r\n"
-          +"\r\n"
-          +"Example:\r\n"
-          +filename+" -z 1\r\n"
-          +filename+" --zone 1\r\n")
-    return
-  elif func == "":
-    print("ZONE (-z, --zone): Specify milight light zone to control (default value: All zone)")
-
-  # Get MAC address
-  if func in ("m", "getmacaddress"):
-    print("Get the milight wifi bridge mac address\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -m\r\n"
-          +filename+" --ip 192.168.1.23 --getMacAddress\r\n")
-    return
-  elif func == "":
-    print("GET MAC ADDRESS (-m, --getMacAddress): Get the milight wifi bridge mac address")
-
-  # Link
-  if func in ("l", "link"):
-    print("Link lights to a specific zone\r\n"
-          +"\r\n"
-          +"Note: In order to make this work, the light must be switch on manually max 3sec before this command\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -l\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --link\r\n")
-    return
-  elif func == "":
-    print("LINK (-l, --link): Link lights to a specific zone")
-
-  # Unlink
-  if func in ("u", "unlink"):
-    print("Unlink lights\r\n"
-          +"\r\n"
-          +"Note: In order to make this work, the light must be switch on manually max 3sec before this command\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -u\r\n"
-          +filename+" --ip 192.168.1.23 --unlink\r\n")
-    return
-  elif func == "":
-    print("UNLINK (-u, --unlink): Unlink lights")
-
-  # Turn lights ON
-  if func in ("o", "turnon"):
-    print("Turn lights on\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -o\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --turnOn\r\n")
-    return
-  elif func == "":
-    print("TURN ON (-o, --turnOn): Turn lights on")
-
-  # Turn lights OFF
-  if func in ("f", "turnoff"):
-    print("Turn lights off\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -f\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --turnOff\r\n")
-    return
-  elif func == "":
-    print("TURN OFF (-o, --turnOff): Turn lights off")
-
-  # Turn wifi bridge lamp ON
-  if func in ("x", "turnonwifibridgelamp"):
-    print("Turn wifi bridge lamp on\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -x\r\n"
-          +filename+" --ip 192.168.1.23 --turnOnWifiBridgeLamp\r\n")
-    return
-  elif func == "":
-    print("TURN WIFI BRIDGE LAMP ON (-x, --turnOnWifiBridgeLamp): Turn wifi bridge lamp on")
-
-  # Turn wifi bridge lamp OFF
-  if func in ("y", "turnoffwifibridgelamp"):
-    print("Turn wifi bridge lamp off\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -y\r\n"
-          +filename+" --ip 192.168.1.23 --turnOffWifiBridgeLamp\r\n")
-    return
-  elif func == "":
-    print("TURN WIFI BRIDGE LAMP OFF (-y, --turnOffWifiBridgeLamp): Turn wifi bridge lamp off")
-
-  # Set night mode
-  if func in ("n", "setnightmode"):
-    print("Set night mode\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -n\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --setNightMode\r\n")
-    return
-  elif func == "":
-    print("SET NIGHT MODE (-n, --setNightMode): Set night mode")
-
-  # Set white mode
-  if func in ("w", "setwhitemode"):
-    print("Set white mode\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -w\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --setWhiteMode\r\n")
-    return
-  elif func == "":
-    print("SET WHITE MODE (-w, --setWhiteMode): Set white mode")
-
-  # Set white mode for bridge lamp
-  if func in ("j", "setwhitemodebridgelamp"):
-    print("Set white mode\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -j\r\n"
-          +filename+" --ip 192.168.1.23 --setWhiteModeBridgeLamp\r\n")
-    return
-  elif func == "":
-    print("SET WHITE MODE ON BRIDGE LAMP (-j, --setWhiteModeBridgeLamp): Set white mode on bridge lamp")
-
-  # Speed up disco mode for bridge lamp
-  if func in ("k", "speedupdiscomodebridgelamp"):
-    print("Speed up disco mode for bridge lamp\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -k\r\n"
-          +filename+" --ip 192.168.1.23 --speedUpDiscoModeBridgeLamp\r\n")
-    return
-  elif func == "":
-    print("SPEED UP DISCO MODE FOR BRIDGE LAMP (-k, --speedUpDiscoModeBridgeLamp): Speed up disco mode for bridge lamp")
-
-  # Slow down disco mode for bridge lamp
-  if func in ("q", "slowdowndiscomodebridgelamp"):
-    print("Slow down disco mode for bridge lamp\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -q\r\n"
-          +filename+" --ip 192.168.1.23 --slowDownDiscoModeBridgeLamp\r\n")
-    return
-  elif func == "":
-    print("SLOW DOWN DISCO MODE FOR BRIDGE LAMP (-q, --slowDownDiscoModeBridgeLamp): Slow down disco mode for bridge lamp")
-
-  # Speed up disco mode
-  if func in ("a", "speedupdiscomode"):
-    print("Speed up disco mode\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -a\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --speedUpDiscoMode\r\n")
-    return
-  elif func == "":
-    print("SPEED UP DISCO MODE (-a, --speedUpDiscoMode): Speed up disco mode")
-
-  # Slow down disco mode
-  if func in ("g", "slowdowndiscomode"):
-    print("Slow down disco mode\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -g\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --slowDownDiscoMode\r\n")
-    return
-  elif func == "":
-    print("SLOW DOWN DISCO MODE (-g, --slowDownDiscoMode): Slow down disco mode")
-
-  # Set specific color
-  if func in ("c", "setcolor"):
-    print("Set specific color (between 0 and 255)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -c 255\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --setColor 255\r\n")
-    return
-  elif func == "":
-    print("SET COLOR (-c, --setColor): Set specific color (between 0 and 255)")
-
-  # Set brightness
-  if func in ("b", "setbrightness"):
-    print("Set brightness (in %)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -b 50\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --setBrightness 50\r\n")
-    return
-  elif func == "":
-    print("SET BRIGHTNESS (-b, --setBrightness): Set brightness (in %)")
-
-  # Set specific color for bridge lamp
-  if func in ("r", "setcolorbridgelamp"):
-    print("Set specific color for the bridge lamp (between 0 and 255)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -r 255\r\n"
-          +filename+" --ip 192.168.1.23 --setColorBridgeLamp 255\r\n")
-    return
-  elif func == "":
-    print("SET COLOR FOR THE BRIDGE LAMP (-r, --setColorBridgeLamp): Set specific color for the bridge lamp (between 0 and 255)")
-
-  # Set brightness for bridge lamp
-  if func in ("v", "setbrightnessbridgelamp"):
-    print("Set brightness for the bridge lamp (in %)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -v 50\r\n"
-          +filename+" --ip 192.168.1.23 --setBrightnessBridgeLamp 50\r\n")
-    return
-  elif func == "":
-    print("SET BRIGHTNESS FOR THE BRIDGE LAMP (-v, --setBrightnessBridgeLamp): Set brightness for the bridge lamp(in %)")
-
-  # Set saturation
-  if func in ("s", "setsaturation"):
-    print("Set saturation (in %)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -s 50\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --setSaturation 50\r\n")
-    return
-  elif func == "":
-    print("SET SATURATION (-s, --setSaturation): Set saturation (in %)")
-
-  # Set temperature
-  if func in ("s", "settemperature"):
-    print("Set temperature (in %)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -e 50\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --setTemperature 50\r\n")
-    return
-  elif func == "":
-    print("SET TEMPERATURE (-e, --setTemperature): Set temperature (in %)")
-
-  # Set disco mode
-  if func in ("d", "setdiscomode"):
-    print("Set disco mode (between 1 and 9)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 -d 5\r\n"
-          +filename+" --ip 192.168.1.23 --zone 1 --setDiscoMode 5\r\n")
-    return
-  elif func == "":
-    print("SET DISCO MODE (-d, --setDiscoMode): Set disco mode (between 1 and 9)")
-
-  # Set disco mode for bridge lamp
-  if func in ("d", "setdiscomodebridgelamp"):
-    print("Set disco mode for bridge lamp (between 1 and 9)\r\n"
-          +"\r\n"
-          +"Usage:\r\n"
-          +filename+" --ip 192.168.1.23 -1 5\r\n"
-          +filename+" --ip 192.168.1.23 --setDiscoModeBridgeLamp 5\r\n")
-    return
-  elif func == "":
-    print("SET DISCO MODE FOR BRIDGE LAMP (-1, --setDiscoModeBridgeLamp): Set disco mode for bridge lamp (between 1 and 9)")
-
-
-  # Add use case examples:
-  if func == "":
-    print("\r\n"
-          +"Some examples (if ip '192.168.1.23', port is 5987):\r\n"
-          +" - Get the mac address: "+filename+" --ip 192.168.1.23 --port 5987 --getMacAddress\r\n"
-          +" - Set disco mode 5 in light zone 1: "+filename+" --ip 192.168.1.23 --port 5987 --zone 1 --setDiscoMode 5\r\n"
-          +" - Light on zone 1: "+filename+" --ip 192.168.1.23 --port 5987 --zone 1 --lightOn\r\n"
-          +" - Light off zone 1: "+filename+" --ip 192.168.1.23 --port 5987 --zone 1 --lightOff\r\n"
-          +" - Light on and set with light in zone 1: "+filename+" --ip 192.168.1.23 --port 5987 --zone 1 --lightOn --setWhiteMode\r\n"
-          +" - Light on all zone: "+filename+" --ip 192.168.1.23 --port 5987 --zone 0 --lightOn\r\n"
-          +" - Light off all zone: "+filename+" --ip 192.168.1.23 --port 5987 --zone 0 --lightOff")
+  # Unknown function: help of all functions
+  if func not in _HELP_INDEX:
+    func = ""
+  # Whole help written at once
+  sys.stdout.write(__renderHelp(func) + "\n")
 
 
 ################################# MAIN FUNCTION ###############################
+# Range of a command line integer argument
+# Keyword arguments:
+#   name -- (string) Name of the value (used in the error message)
+#   minValue -- (int) Minimum value
+#   maxValue -- (int) Maximum value
+#   unit -- (string) Unit of the value (used in the error message)
+_ValueRange = collections.namedtuple("_ValueRange", "name minValue maxValue unit")
+
+_COLOR_RANGE = _ValueRange("Color", 0, 255, "")
+_BRIGHTNESS_RANGE = _ValueRange("Brightness", 0, 100, " (in %)")
+_SATURATION_RANGE = _ValueRange("Saturation", 0, 100, " (in %)")
+_TEMPERATURE_RANGE = _ValueRange("Temperature", 0, 100, " (in %)")
+_DISCO_MODE_RANGE = _ValueRange("Disco mode", 1, 9, "")
+_ZONE_RANGE = _ValueRange("Zone", 0, 4, "")
+_TIMEOUT_RANGE = _ValueRange("Timeout", 1, None, "sec")
+_PORT_RANGE = _ValueRange("Port", 1, 65535, "")
+
+# Base parameters (in checking order): name (also used to get help) => range and error message if invalid
+_BASE_PARAMETERS = collections.OrderedDict((
+  ("zone", (_ZONE_RANGE, "[ERROR] You need to specify a valid zone ID (between 0 and 4)\r\n")),
+  ("timeout", (_TIMEOUT_RANGE, "[ERROR] You need to specify a valid timeout (more than 0sec)\r\n")),
+  ("port", (_PORT_RANGE, "[ERROR] You need to specify a valid port (more than 0)\r\n")),
+))
+
+# Options of the base parameters: short and long option => base parameter name
+_BASE_OPTIONS = {"-z": "zone", "--zone": "zone", "-t": "timeout", "--timeout": "timeout", "-p": "port", "--port": "port"}
+_HELP_OPTIONS = frozenset(("-h", "--help"))
+_IP_OPTIONS = frozenset(("-i", "--ip"))
+
+def __getValueInRange(argument, valueRange):
+  """Give the value of a command line integer argument which must be in a specific range
+
+  Keyword arguments:
+    argument -- (string) Command line argument
+    valueRange -- (_ValueRange) Range of the value (no maximum value if None)
+
+  return: (int) Value (ValueError raised with an error message if not an integer or not in the range)
+  """
+  try:
+    value = int(argument)
+  except ValueError:
+    value = None
+  if value is None or value < valueRange.minValue or (valueRange.maxValue is not None and value > valueRange.maxValue):
+    raise ValueError("{} must be between {} and {}{}".format(valueRange.name, valueRange.minValue,
+                                                             valueRange.maxValue, valueRange.unit))
+  return value
+
+def __getMacAddressRequest(milight):
+  """Get and show the milight wifi bridge MAC address (command line request)
+
+  Keyword arguments:
+    milight -- (MilightWifiBridge) Milight wifi bridge (already initialized)
+
+  return: (bool) MAC address received
+  """
+  macAddress = milight.getMacAddress()
+  if macAddress != "":
+    print("Mac address: {}".format(macAddress))
+  else:
+    print("Failed to get mac address")
+  return macAddress != ""
+
+# Command line request
+# Keyword arguments:
+#   request -- (function) Send the request (arguments: milight wifi bridge, value and zone ID) and give the result
+#   valueRange -- (_ValueRange) Range of the option argument (None if the option has no argument)
+#   message -- (string) Message showing the result (arguments: value, zone and result), None if shown by the request
+_CliRequest = collections.namedtuple("_CliRequest", "request valueRange message")
+
+# Command line requests: short and long option (interned) => request
+_CMD_DISPATCH = {}
+for _options, _cliRequest in (
+  (("-m", "--getMacAddress"), _CliRequest(lambda milight, value, zone: __getMacAddressRequest(milight), None, None)),
+  (("-l", "--link"), _CliRequest(lambda milight, value, zone: milight.link(zone), None,
+                                 "Link zone {zone}: {result}")),
+  (("-u", "--unlink"), _CliRequest(lambda milight, value, zone: milight.unlink(zone), None,
+                                   "Unlink zone {zone}: {result}")),
+  (("-o", "--turnOn"), _CliRequest(lambda milight, value, zone: milight.turnOn(zone), None,
+                                   "Turn on zone {zone}: {result}")),
+  (("-f", "--turnOff"), _CliRequest(lambda milight, value, zone: milight.turnOff(zone), None,
+                                    "Turn off zone {zone}: {result}")),
+  (("-x", "--turnOnWifiBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.turnOnWifiBridgeLamp(), None,
+                                                 "Turn on wifi bridge lamp: {result}")),
+  (("-y", "--turnOffWifiBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.turnOffWifiBridgeLamp(), None,
+                                                  "Turn off wifi bridge lamp: {result}")),
+  (("-j", "--setWhiteModeBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.setWhiteModeBridgeLamp(), None,
+                                                   "Set white mode to wifi bridge: {result}")),
+  (("-k", "--speedUpDiscoModeBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.speedUpDiscoModeBridgeLamp(), None,
+                                                       "Speed up disco mode to wifi bridge: {result}")),
+  (("-q", "--slowDownDiscoModeBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.slowDownDiscoModeBridgeLamp(), None,
+                                                        "Slow down disco mode to wifi bridge: {result}")),
+  (("-r", "--setColorBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.setColorBridgeLamp(value), _COLOR_RANGE,
+                                               "Set color {value} to wifi bridge: {result}")),
+  (("-v", "--setBrightnessBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.setBrightnessBridgeLamp(value),
+                                                    _BRIGHTNESS_RANGE, "Set brightness {value}% to the wifi bridge: {result}")),
+  (("-1", "--setDiscoModeBridgeLamp"), _CliRequest(lambda milight, value, zone: milight.setDiscoModeBridgeLamp(value),
+                                                   _DISCO_MODE_RANGE, "Set disco mode {value} to wifi bridge: {result}")),
+  (("-n", "--setNightMode"), _CliRequest(lambda milight, value, zone: milight.setNightMode(zone), None,
+                                         "Set night mode to zone {zone}: {result}")),
+  (("-w", "--setWhiteMode"), _CliRequest(lambda milight, value, zone: milight.setWhiteMode(zone), None,
+                                         "Set white mode to zone {zone}: {result}")),
+  (("-a", "--speedUpDiscoMode"), _CliRequest(lambda milight, value, zone: milight.speedUpDiscoMode(zone), None,
+                                             "Speed up disco mode to zone {zone}: {result}")),
+  (("-g", "--slowDownDiscoMode"), _CliRequest(lambda milight, value, zone: milight.slowDownDiscoMode(zone), None,
+                                              "Slow down disco mode to zone {zone}: {result}")),
+  (("-d", "--setDiscoMode"), _CliRequest(lambda milight, value, zone: milight.setDiscoMode(value, zone),
+                                         _DISCO_MODE_RANGE, "Set disco mode {value} to zone {zone}: {result}")),
+  (("-c", "--setColor"), _CliRequest(lambda milight, value, zone: milight.setColor(value, zone), _COLOR_RANGE,
+                                     "Set color {value} to zone {zone}: {result}")),
+  (("-b", "--setBrightness"), _CliRequest(lambda milight, value, zone: milight.setBrightness(value, zone),
+                                          _BRIGHTNESS_RANGE, "Set brightness {value}% to zone {zone}: {result}")),
+  (("-s", "--setSaturation"), _CliRequest(lambda milight, value, zone: milight.setSaturation(value, zone),
+                                          _SATURATION_RANGE, "Set saturation {value}% to zone {zone}: {result}")),
+  (("-e", "--setTemperature"), _CliRequest(lambda milight, value, zone: milight.setTemperature(value, zone),
+                                           _TEMPERATURE_RANGE, "Set temperature {value}% to zone {zone}: {result}")),
+):
+  for _option in _options:
+    _CMD_DISPATCH[_intern(_option)] = _cliRequest
+del _options, _cliRequest, _option
+
+def __runCliRequest(milight, cliRequest, value, zone):
+  """Send a command line request and show its result
+
+  Keyword arguments:
+    milight -- (MilightWifiBridge) Milight wifi bridge (already initialized)
+    cliRequest -- (_CliRequest) Request to send
+    value -- (int) Checked value of the option argument (None if the option has no argument)
+    zone -- (int) Zone ID
+
+  return: (bool) Request received by the wifi bridge
+  """
+  res = cliRequest.request(milight, value, zone)
+
+  if cliRequest.message is not None:
+    print(cliRequest.message.format(value=value, zone=zone, result=res))
+
+  return res
+
 def main(parsed_args = sys.argv[1:]):
   """Shell Milight utility function"""
 
-  # Set the log level (no log will be shown if "logging.CRITICAL" is used)
+  # Show the logs (handler added before creating the milight wifi bridge) and set the log level
+  # of the root logger only, inherited by the MilightWifiBridge class logger
+  # (no log will be shown if "logging.CRITICAL" is used)
+  logging.basicConfig()
   logger = logging.getLogger()
   logger.setLevel(logging.CRITICAL) #Other parameters: logging.DEBUG, logging.WARNING, logging.ERROR
 
   ip = "" # No default IP, must be specified by the user
-  port = 5987 # Default milight 3.0 port
-  zone = 0 # By default, all zone are controlled
-  timeout = 5.0 # By default, Wait maximum 5sec
+  baseParameters = {
+    "port": 5987, # Default milight 3.0 port
+    "zone": 0, # By default, all zone are controlled
+    "timeout": 5.0, # By default, Wait maximum 5sec
+  }
+  baseArguments = {} # Base parameters specified by the user (not checked yet)
 
   # Get options
   try:
@@ -1081,41 +1418,38 @@ def main(parsed_args = sys.argv[1:]):
                                 "setWhiteModeBridgeLamp", "speedUpDiscoModeBridgeLamp", "slowDownDiscoModeBridgeLamp",
                                 "setColorBridgeLamp=", "setBrightnessBridgeLamp=", "setDiscoModeBridgeLamp="])
   except getopt.GetoptError as err:
-    print("[ERROR] "+str(err))
+    print("[ERROR] {}".format(err))
     __help()
     sys.exit(1)
 
-  # Show help (if requested)
+  # Read all options in a single pass (requests are kept in the requested order and checked later)
+  helpRequested = False
+  cliRequests = []
   for o, a in opts:
-    if o in ("-h", "--help"):
-      if len(args) >= 1:
-        __help(args[0])
-      else:
-        __help()
-      sys.exit(0)
-    elif o in ("-l", "--debug"):
+    # Options built by getopt are not interned (dict lookup then matches the key by identity)
+    o = _intern(o)
+    cliRequest = _CMD_DISPATCH.get(o)
+    if cliRequest is not None:
+      cliRequests.append((cliRequest, a))
+    elif o in _BASE_OPTIONS:
+      baseArguments[_BASE_OPTIONS[o]] = a
+    elif o in _IP_OPTIONS:
+      ip = str(a)
+    elif o in _HELP_OPTIONS:
+      helpRequested = True
+    elif o == "--debug":
       print("Debugging...")
-      logger = logging.getLogger()
       logger.setLevel(logging.DEBUG)
-    elif o in ("-z", "--nodebug"):
-      logger = logging.getLogger()
+    elif o == "--nodebug":
       logger.setLevel(logging.CRITICAL)
 
-
-  # Get base parameters
-  for o, a in opts:
-    if o in ("-i", "--ip"):
-      ip = str(a)
-      continue
-    if o in ("-p", "--port"):
-      port = int(a)
-      continue
-    if o in ("-t", "--timeout"):
-      timeout = int(a)
-      continue
-    if o in ("-z", "--zone"):
-      zone = int(a)
-      continue
+  # Show help (if requested)
+  if helpRequested:
+    if len(args) >= 1:
+      __help(args[0])
+    else:
+      __help()
+    sys.exit(0)
 
   # Check base parameters
   if ip == "":
@@ -1123,200 +1457,52 @@ def main(parsed_args = sys.argv[1:]):
     __help("ip")
     sys.exit(1)
 
-  if zone < 0 or zone > 4:
-    print("[ERROR] You need to specify a valid zone ID (between 0 and 4)\r\n")
-    __help("zone")
-    sys.exit(1)
+  for name, (valueRange, errorMessage) in _BASE_PARAMETERS.items():
+    if name in baseArguments:
+      try:
+        baseParameters[name] = __getValueInRange(baseArguments[name], valueRange)
+      except ValueError:
+        print(errorMessage)
+        __help(name)
+        sys.exit(1)
+  port = baseParameters["port"]
+  zone = baseParameters["zone"]
+  timeout = baseParameters["timeout"]
 
-  if timeout <= 0:
-    print("[ERROR] You need to specify a valid timeout (more than 0sec)\r\n")
-    __help("timeout")
-    sys.exit(1)
+  # Show base parameters
+  sys.stdout.write("Ip: {}\nZone: {}\nTimeout: {}\nPort: {}\n".format(ip, zone, timeout, port))
+
+  # Check all requested commands (in the requested order) before sending any of them
+  for index, (cliRequest, argument) in enumerate(cliRequests):
+    value = None
+    if cliRequest.valueRange is not None:
+      try:
+        value = __getValueInRange(argument, cliRequest.valueRange)
+      except ValueError as err:
+        print("[ERROR] {}".format(err))
+        sys.exit(2)
+    cliRequests[index] = (cliRequest, value)
 
-  if port <= 0:
-    print("[ERROR] You need to specify a valid port (more than 0)\r\n")
-    __help("port")
+  if len(cliRequests) == 0:
+    print("[ERROR] You must call one action, use '-h' to get more information.")
     sys.exit(1)
 
-  # Show base parameters
-  print("Ip: "+str(ip))
-  print("Zone: "+str(zone))
-  print("Timeout: "+str(timeout))
-  print("Port: "+str(port))
-
   # Initialize Milight bridge
   milight = MilightWifiBridge()
   milight.close()
   is_init = milight.setup(ip, port, timeout)
-  logging.debug("Milight bridge connection initialized with ip {}:{} : {}".format(ip, port, is_init))
+  _log.debug("Milight bridge connection initialized with ip %s:%s : %s", ip, port, is_init)
   if (not is_init):
     print("[ERROR] Initialization failed, re-check the ip (and the port), use '-h' to get more information.")
     sys.exit(2)
 
-  # Execute requested commands in the requested order
-  returnValue = True
-  atLeastOneRequestDone = False
-
-  for o, a in opts:
-    if o in ("-m", "--getMacAddress"):
-      atLeastOneRequestDone = True
-      macAddress = milight.getMacAddress()
-      returnValue &= (macAddress != "")
-      if macAddress != "":
-        print("Mac address: "+str(macAddress))
-      else:
-        print("Failed to get mac address")
-    elif o in ("-l", "--link"):
-      atLeastOneRequestDone = True
-      res = milight.link(zoneId=zone)
-      returnValue &= res
-      print("Link zone "+str(zone)+": "+str(res))
-    elif o in ("-u", "--unlink"):
-      atLeastOneRequestDone = True
-      res = milight.unlink(zoneId=zone)
-      returnValue &= res
-      print("Unlink zone "+str(zone)+": "+str(res))
-    elif o in ("-o", "--turnOn"):
-      atLeastOneRequestDone = True
-      res = milight.turnOn(zoneId=zone)
-      returnValue &= res
-      print("Turn on zone "+str(zone)+": "+str(res))
-    elif o in ("-f", "--turnOff"):
-      atLeastOneRequestDone = True
-      res = milight.turnOff(zoneId=zone)
-      returnValue &= res
-      print("Turn off zone "+str(zone)+": "+str(res))
-    elif o in ("-x", "--turnOnWifiBridgeLamp"):
-      atLeastOneRequestDone = True
-      res = milight.turnOnWifiBridgeLamp()
-      returnValue &= res
-      print("Turn on wifi bridge lamp: "+str(res))
-    elif o in ("-y", "--turnOffWifiBridgeLamp"):
-      atLeastOneRequestDone = True
-      res = milight.turnOffWifiBridgeLamp()
-      returnValue &= res
-      print("Turn off wifi bridge lamp: "+str(res))
-    elif o in ("-j", "--setWhiteModeBridgeLamp"):
-      atLeastOneRequestDone = True
-      res = milight.setWhiteModeBridgeLamp()
-      returnValue &= res
-      print("Set white mode to wifi bridge: "+str(res))
-    elif o in ("-k", "--speedUpDiscoModeBridgeLamp"):
-      atLeastOneRequestDone = True
-      res = milight.speedUpDiscoModeBridgeLamp()
-      returnValue &= res
-      print("Speed up disco mode to wifi bridge: "+str(res))
-    elif o in ("-q", "--slowDownDiscoModeBridgeLamp"):
-      atLeastOneRequestDone = True
-      res = milight.slowDownDiscoModeBridgeLamp()
-      returnValue &= res
-      print("Slow down disco mode to wifi bridge: "+str(res))
-    elif o in ("-r", "--setColorBridgeLamp"):
-      userColor = int(a)
-      if userColor < 0 or userColor > 255:
-        print("[ERROR] Color must be between 0 and 255")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setColorBridgeLamp(color=userColor)
-      returnValue &= res
-      print("Set color "+str(userColor)+" to wifi bridge: "+str(res))
-    elif o in ("-v", "--setBrightnessBridgeLamp"):
-      userBrightness = int(a)
-      if userBrightness < 0 or userBrightness > 100:
-        print("[ERROR] Brightness must be between 0 and 100 (in %)")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setBrightnessBridgeLamp(brightness=userBrightness)
-      returnValue &= res
-      print("Set brightness "+str(userBrightness)+"% to the wifi bridge: "+str(res))
-    elif o in ("-1", "--setDiscoModeBridgeLamp"):
-      mode = int(a)
-      if mode < 1 or mode > 9:
-        print("[ERROR] Disco mode must be between 1 and 9")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setDiscoModeBridgeLamp(discoMode=mode)
-      returnValue &= res
-      print("Set disco mode "+str(mode)+" to wifi bridge: "+str(res))
-    elif o in ("-n", "--setNightMode"):
-      atLeastOneRequestDone = True
-      res = milight.setNightMode(zoneId=zone)
-      returnValue &= res
-      print("Set night mode to zone "+str(zone)+": "+str(res))
-    elif o in ("-w", "--setWhiteMode"):
-      atLeastOneRequestDone = True
-      res = milight.setWhiteMode(zoneId=zone)
-      returnValue &= res
-      print("Set white mode to zone "+str(zone)+": "+str(res))
-    elif o in ("-a", "--speedUpDiscoMode"):
-      atLeastOneRequestDone = True
-      res = milight.speedUpDiscoMode(zoneId=zone)
-      returnValue &= res
-      print("Speed up disco mode to zone "+str(zone)+": "+str(res))
-    elif o in ("-g", "--slowDownDiscoMode"):
-      atLeastOneRequestDone = True
-      res = milight.slowDownDiscoMode(zoneId=zone)
-      returnValue &= res
-      print("Slow down disco mode to zone "+str(zone)+": "+str(res))
-    elif o in ("-d", "--setDiscoMode"):
-      mode = int(a)
-      if mode < 1 or mode > 9:
-        print("[ERROR] Disco mode must be between 1 and 9")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setDiscoMode(discoMode=mode, zoneId=zone)
-      returnValue &= res
-      print("Set disco mode "+str(mode)+" to zone "+str(zone)+": "+str(res))
-    elif o in ("-c", "--setColor"):
-      userColor = int(a)
-      if userColor < 0 or userColor > 255:
-        print("[ERROR] Color must be between 0 and 255")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setColor(color=userColor, zoneId=zone)
-      returnValue &= res
-      print("Set color "+str(userColor)+" to zone "+str(zone)+": "+str(res))
-    elif o in ("-b", "--setBrightness"):
-      userBrightness = int(a)
-      if userBrightness < 0 or userBrightness > 100:
-        print("[ERROR] Brightness must be between 0 and 100 (in %)")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setBrightness(brightness=userBrightness, zoneId=zone)
-      returnValue &= res
-      print("Set brightness "+str(userBrightness)+"% to zone "+str(zone)+": "+str(res))
-    elif o in ("-s", "--setSaturation"):
-      userSaturation = int(a)
-      if userSaturation < 0 or userSaturation > 100:
-        print("[ERROR] Saturation must be between 0 and 100 (in %)")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setSaturation(saturation=userSaturation, zoneId=zone)
-      returnValue &= res
-      print("Set saturation "+str(userSaturation)+"% to zone "+str(zone)+": "+str(res))
-    elif o in ("-e", "--setTemperature"):
-      userTemperature = int(a)
-      if userTemperature < 0 or userTemperature > 100:
-        print("[ERROR] Temperature must be between 0 and 100 (in %)")
-        sys.exit(2)
-      atLeastOneRequestDone = True
-      res = milight.setTemperature(temperature=userTemperature, zoneId=zone)
-      returnValue &= res
-      print("Set temperature "+str(userTemperature)+"% to zone "+str(zone)+": "+str(res))
-
-    # In case an error occured in any of the request, stop the program
-    if not returnValue:
-      break
-
-  if not atLeastOneRequestDone:
-    print("[ERROR] You must call one action, use '-h' to get more information.")
-    sys.exit(1)
-  if not returnValue:
+  # Execute requested commands one after the other in the requested order
+  # (all() stops at the first failed request: no request is sent after it)
+  if not all(__runCliRequest(milight, cliRequest, value, zone) for cliRequest, value in cliRequests):
     print("[ERROR] Request failed")
     sys.exit(1)
 
-  if atLeastOneRequestDone and returnValue:
-    sys.exit(0)
+  sys.exit(0)
 
 if __name__ == '__main__':
   main()
@@ -40,6 +40,6 @@ setup(
     packages=["MilightWifiBridge"],
     platforms='any',
     install_requires=[],
-    tests_require=["mock"],
+    tests_require=[],
     test_suite="tests",
 )
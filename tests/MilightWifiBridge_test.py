@@ -7,16 +7,13 @@
 """
 
 import unittest
+import collections
 from MilightWifiBridge import MilightWifiBridge
 import logging
-import time
+import os
 import sys
-
-# Python 2.7/3  (Mock)
-if sys.version_info >= (3, 3):
-  from unittest.mock import patch
-else:
-  from mock import patch
+import socket
+import threading
 
 # Python 2.7/3 compatibility (StringIO)
 try:
@@ -24,9 +21,87 @@ try:
 except ImportError:
   from io import StringIO
 
-class CapturingStdOut(list):
+# Start session request sent by the library and response of the bridge
+_START_SESSION_IN = bytes(bytearray([0x20,0x00,0x00,0x00,0x16,0x02,0x62,0x3a,0xd5,0xed,0xa3,0x01,0xae,
+                                     0x08,0x2d,0x46,0x61,0x41,0xa7,0xf6,0xdc,0xaf,0xd3,0xe6,0x00,0x00,0x1e]))
+_START_SESSION_OUT = bytes(bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x08,0x09,0x10,0x11,0x12,0x13,0x14,
+                                      0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22]))
+
+# Beginning of every request (before the sequence number)
+_REQUEST_PREFIX = bytes(bytearray([0x80, 0x00, 0x00, 0x00, 0x11, 0x20, 0x21, 0x00]))
+
+# Requests already built (key: (command, zoneId, seq_number))
+_REQUESTS = {}
+
+def _buildRequest(command, zoneId, seq_number):
+  """
+  Build (once) the request the library should send
+
+  Keyword arguments:
+    command -- (bytes) 9 bytes command
+    zoneId -- (int) Zone ID
+    seq_number -- (int) Sequence number of the request
+
+  return: (bytes) Request frame
   """
-  Capture stdout and give it back into a variable.
+  key = (command, zoneId, seq_number)
+  request = _REQUESTS.get(key)
+  if request is None:
+    checkSum = (sum(bytearray(command)) + zoneId) & 0xFF
+    request = b"".join((_REQUEST_PREFIX, bytes(bytearray([seq_number, 0x00])), command,
+                        bytes(bytearray([zoneId, 0x00, checkSum]))))
+    _REQUESTS[key] = request
+  return request
+
+def _buildAck(seq_number):
+  """
+  Build the response (ACK) of the wifi bridge to a request
+
+  Keyword arguments:
+    seq_number -- (int) Sequence number of the acknowledged request
+
+  return: (bytes) Response frame
+  """
+  return bytes(bytearray([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, seq_number, 0x00]))
+
+def _runFakeBridge(sock, requestCount, receivedFrames):
+  """
+  Answer like a wifi bridge (on a real UDP socket) until "requestCount" requests are acknowledged
+
+  Keyword arguments:
+    sock -- (socket.socket) Bound UDP socket of the fake wifi bridge (with a timeout)
+    requestCount -- (int) Number of different requests (sequence numbers) to acknowledge
+    receivedFrames -- (list) Every frame received (filled by the fake wifi bridge)
+  """
+  acknowledged = set()
+  try:
+    while len(acknowledged) < requestCount:
+      frame, address = sock.recvfrom(64)
+      receivedFrames.append(frame)
+      if frame == _START_SESSION_IN:
+        sock.sendto(_START_SESSION_OUT, address)
+      else:
+        sequenceNumber = bytearray(frame)[8]
+        acknowledged.add(sequenceNumber)
+        sock.sendto(_buildAck(sequenceNumber), address)
+  except socket.timeout:
+    pass
+
+# Topics of the specific help (--help <topic>)
+_HELP_TOPICS = ("help", "ip", "port", "timeout", "zone", "getmacaddress", "link", "unlink", "turnon",
+                "turnoff", "turnonwifibridgelamp", "turnoffwifibridgelamp", "setnightmode", "setwhitemode",
+                "setwhitemodebridgelamp", "speedupdiscomodebridgelamp", "slowdowndiscomodebridgelamp",
+                "speedupdiscomode", "slowdowndiscomode", "setcolor", "setbrightness", "setcolorbridgelamp",
+                "setbrightnessbridgelamp", "setsaturation", "settemperature", "setdiscomode",
+                "setdiscomodebridgelamp")
+
+# Scripts of single command tests (key: (command, zoneId, milight_response)), only made of immutable bytes
+# since they are shared by all the tests
+_SINGLE_SCRIPTS = {}
+
+class CapturingStdOut(object):
+  """
+  Capture stdout and give it back into a variable (lines only split when first inspected).
 
   Example:
   with CapturingStdOut() as std_output:
@@ -34,75 +109,120 @@ class CapturingStdOut(list):
   print(std_output)
   """
   def __enter__(self):
+    self._output = ""
+    self._lines = None
     self._stdout = sys.stdout
     sys.stdout = self._stringio = StringIO()
     return self
   def __exit__(self, *args):
-    self.extend(self._stringio.getvalue().splitlines())
+    self._output = self._stringio.getvalue()
     del self._stringio    # free up some memory
     sys.stdout = self._stdout
+  def __getLines(self):
+    if self._lines is None:
+      self._lines = self._output.splitlines()
+    return self._lines
+  def __contains__(self, line):
+    # A line which is not even a substring of the output can't be one of its lines
+    return (line in self._output) and (line in self.__getLines())
+  def __iter__(self):
+    return iter(self.__getLines())
+  def __len__(self):
+    return len(self.__getLines())
+  def __repr__(self):
+    return repr(self.__getLines())
 
 class MockSocket:
-  __read_write = []
+  __read_write = collections.deque()
+  __timeouts = []
 
   @staticmethod
   def initializeMock(read_write):
-    MockSocket.__read_write = read_write
+    MockSocket.__read_write = collections.deque(read_write)
+    MockSocket.__timeouts = []
+
+  @staticmethod
+  def pending():
+    # Exchanges not done yet (in order)
+    return list(MockSocket.__read_write)
+
+  @staticmethod
+  def timeouts():
+    # Timeouts set on the socket since the mock was initialized (in order)
+    return list(MockSocket.__timeouts)
 
   @staticmethod
   def initializeMilight(ip = "127.0.0.1", port = 100):
+    # New instance each time (no session or sequence number kept from a previous test)
     milight = MilightWifiBridge.MilightWifiBridge()
     milight.setup(ip, port)
 
     return milight
 
   @staticmethod
-  def initializeMockAndMilight(command, zoneId, milight_response):
-    def calculateCheckSum(command, zoneId):
-      checkSum = 0
-      for byteCommand in command:
-        checkSum += byteCommand
-      checkSum += zoneId
-
-      return (checkSum & 0xFF)
+  def initializeMockAndMilight(command, zoneId, milight_response, batch=False, retries=3):
+    # Requests without response are sent again "retries" times (with the same sequence number),
+    # except link, unlink and disco mode speed up/slow down requests
+    # Single command: script built once and reused by the next tests
+    singleKey = None
+    if (isinstance(command, (bytes, bytearray)) and isinstance(milight_response, bool) and isinstance(zoneId, int)):
+      singleKey = (bytes(command), zoneId, milight_response, retries)
+      if singleKey in _SINGLE_SCRIPTS:
+        MockSocket.initializeMock(_SINGLE_SCRIPTS[singleKey])
+        return MockSocket.initializeMilight()
 
-    if (isinstance(command, bytearray) and isinstance(milight_response, bool) and isinstance(zoneId, int)):
       command = [command]
       milight_response = [milight_response]
       zoneId = [zoneId]
 
     read_write = []
+    responses = []
+    unanswered = []
 
     seq_number = 1
     for index in range(len(command)):
-      read_write.append(
-        # Start session request
-        {'IN': bytearray([0x20,0x00,0x00,0x00,0x16,0x02,0x62,0x3a,0xd5,0xed,0xa3,0x01,0xae,
-                          0x08,0x2d,0x46,0x61,0x41,0xa7,0xf6,0xdc,0xaf,0xd3,0xe6,0x00,0x00,0x1e])})
-      read_write.append(
-        # Start session response
-        {'OUT': bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x08,0x09,0x10,0x11,0x12,0x13,0x14,
-                           0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22])})
-
-      bytesToSend = bytearray([0x80, 0x00, 0x00, 0x00, 0x11, 0x20, 0x21, 0x00, seq_number, 0x00])
-      bytesToSend += bytearray(command[index])
-      bytesToSend += bytearray([int(zoneId[index]), 0x00])
-      bytesToSend += bytearray([int(calculateCheckSum(bytearray(command[index]), int(zoneId[index])))])
+      # Session is started once and then reused by the next requests
+      if index == 0:
+        read_write.append(('IN', _START_SESSION_IN))
+        read_write.append(('OUT', _START_SESSION_OUT))
 
       # Request
-      read_write.append({'IN': bytesToSend})
-
-      # Response
-      if len(milight_response) > index:
-        if milight_response[index]:
-          read_write.append({'OUT': bytearray([0x00,0x00,0x00,0x00,0x00,0x00,seq_number,0x00])})
+      request = ('IN', _buildRequest(bytes(command[index]), int(zoneId[index]), seq_number))
+      read_write.append(request)
+
+      # Response (received after all requests if sent in a batch)
+      if len(milight_response) > index and milight_response[index]:
+        response = ('OUT', _buildAck(seq_number))
+        if batch:
+          responses.append(response)
+        else:
+          read_write.append(response)
+      elif bytes(command[index]) in _NOT_RESENT_COMMANDS:
+        # Request never sent again (applied twice by the wifi bridge if only its response was lost)
+        pass
+      elif batch:
+        unanswered.append(request)
+      else:
+        read_write.extend([request] * retries)
 
       seq_number += 1
 
-    MockSocket.initializeMock(read_write)
+    # Requests of a batch without response are sent again together (after receiving the other responses)
+    script = tuple(read_write + responses + unanswered * retries)
+    if singleKey is not None:
+      _SINGLE_SCRIPTS[singleKey] = script
+
+    MockSocket.initializeMock(script)
 
     return MockSocket.initializeMilight()
 
+  @staticmethod
+  def initializeMockAndMilightBatch(requests, batch=True, retries=3):
+    # requests: (command, zoneId, milight_response) of each request (sent in a batch or one after the other)
+    command, zoneId, milight_response = zip(*requests)
+    return MockSocket.initializeMockAndMilight(list(command), list(zoneId), list(milight_response),
+                                               batch=batch, retries=retries)
+
   def __init__(self, family = None, type = None):
     return
 
@@ -116,35 +236,72 @@ class MockSocket:
     return
 
   def settimeout(self, timeout_sec):
+    MockSocket.__timeouts.append(timeout_sec)
+
+  def setblocking(self, flag):
+    return
+
+  def setsockopt(self, level, option, value):
     return
 
   def send(self, data):
     return self.sendto(data, None)
 
   def sendto(self, data, addr):
-    if len(MockSocket.__read_write) > 0:
-      if 'IN' in MockSocket.__read_write[0]:
-        check_val = MockSocket.__read_write[0]['IN']
-        if bytearray(data) != bytearray(check_val):
-          raise AssertionError('Mock Socket: Should write "' + str(check_val) + '" but "'+str(data)+'" requested')
+    # 'IN': data written, 'FAIL': data written but the socket raises an error
+    if not MockSocket.__read_write or MockSocket.__read_write[0][0] not in ('IN', 'FAIL'):
+      raise AssertionError('Mock Socket: Nothing should be written but "' + str(data) + '" requested')
 
-        MockSocket.__read_write.pop(0)
-        return len(data)
+    direction, check_val = MockSocket.__read_write[0]
+    if bytes(data) != check_val:
+      raise AssertionError('Mock Socket: Should write "' + str(check_val) + '" but "'+str(data)+'" requested')
 
-    return 0
+    MockSocket.__read_write.popleft()
+    if direction == 'FAIL':
+      raise socket.error("Mock Socket: failed to write")
+    return len(data)
 
   def recvfrom(self, bufsize):
-    if len(MockSocket.__read_write) > 0:
-      if 'OUT' in MockSocket.__read_write[0]:
-        if len(MockSocket.__read_write[0]) <= bufsize:
-          val = MockSocket.__read_write[0]['OUT']
-          MockSocket.__read_write.pop(0)
-          return (val, None)
-        else:
-          val = MockSocket.__read_write[0]['OUT'][:bufsize]
-          MockSocket.__read_write[0]['OUT'] = MockSocket.__read_write[0]['OUT'][bufsize:]
-          return (val, None)
-    return ("", None)
+    # Nothing to receive yet: same as the wifi bridge not answering before the timeout
+    if not MockSocket.__read_write or MockSocket.__read_write[0][0] != 'OUT':
+      raise socket.timeout("timed out")
+
+    direction, val = MockSocket.__read_write[0]
+    if len(val) <= bufsize:
+      MockSocket.__read_write.popleft()
+    else:
+      # Rest of the payload kept as a view (no copy) for the next read
+      val = memoryview(val)
+      MockSocket.__read_write[0] = (direction, val[bufsize:])
+      val = val[:bufsize]
+    if isinstance(val, memoryview):
+      val = val.tobytes()
+    return (val, None)
+
+  def recvfrom_into(self, buffer, nbytes = 0):
+    val, addr = self.recvfrom(nbytes if nbytes > 0 else len(buffer))
+    buffer[:len(val)] = val
+    return (len(val), addr)
+
+# Commands never sent again by the library (filled once BasicCommandRequest is defined)
+_NOT_RESENT_COMMANDS = set()
+
+def _cachedCommand(getCommand):
+  """
+  Build (once) each command returned by a command factory
+
+  Keyword arguments:
+    getCommand -- (function) Command factory taking a single value
+
+  return: (function) Factory returning a cached (bytes) command
+  """
+  commands = {}
+  def getCachedCommand(value):
+    command = commands.get(value)
+    if command is None:
+      command = commands[value] = bytes(getCommand(value))
+    return command
+  return getCachedCommand
 
 class BasicCommandRequest:
     LINK_CMD = bytearray([0x3d,0x00,0x00,0x08,0x00,0x00,0x00,0x00,0x00])
@@ -161,72 +318,143 @@ class BasicCommandRequest:
     DISCO_MODE_SLOW_DOWN_CMD = bytearray([0x31,0x00,0x00,0x08,0x04,0x04,0x00,0x00,0x00])
     WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD = bytearray([0x31,0x00,0x00,0x00,0x03,0x01,0x00,0x00,0x00])
     @staticmethod
+    @_cachedCommand
     def getDiscoModeCmd(mode):
       return bytearray([0x31, 0x00, 0x00, 0x08, 0x06, mode, 0x00, 0x00, 0x00])
     @staticmethod
+    @_cachedCommand
     def getDiscoModeBridgeCmd(mode):
       return bytearray([0x31, 0x00, 0x00, 0x00, 0x04, mode, 0x00, 0x00, 0x00])
     @staticmethod
+    @_cachedCommand
     def getColorCmd(color):
       return bytearray([0x31, 0x00, 0x00, 0x08, 0x01, color, color, color, color])
     @staticmethod
+    @_cachedCommand
     def getColorBridgeCmd(color):
       return bytearray([0x31, 0x00, 0x00, 0x00, 0x01, color, color, color, color])
     @staticmethod
+    @_cachedCommand
     def getBrightnessCmd(brightness):
       return bytearray([0x31, 0x00, 0x00, 0x08, 0x03, brightness, 0x00, 0x00, 0x00])
     @staticmethod
+    @_cachedCommand
     def getBrightnessBridgeCmd(brightness):
       return bytearray([0x31, 0x00, 0x00, 0x00, 0x02, brightness, 0x00, 0x00, 0x00])
     @staticmethod
+    @_cachedCommand
     def getSaturationCmd(saturation):
       return bytearray([0x31, 0x00, 0x00, 0x08, 0x02, saturation, 0x00, 0x00, 0x00])
     @staticmethod
+    @_cachedCommand
     def getTemperatureCmd(temperature):
       return bytearray([0x31, 0x00, 0x00, 0x08, 0x05, temperature, 0x00, 0x00, 0x00])
 
+# Requests without value (command, zoneId, request name, request arguments) succeeding only if acknowledged
+_NOT_RESENT_COMMANDS.update(bytes(command) for command in (
+  BasicCommandRequest.LINK_CMD, BasicCommandRequest.UNLINK_CMD,
+  BasicCommandRequest.DISCO_MODE_SPEED_UP_CMD, BasicCommandRequest.DISCO_MODE_SLOW_DOWN_CMD,
+  BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD))
+
+_SIMPLE_REQUESTS = (
+  (BasicCommandRequest.ON_CMD, 2, "turnOn", (2,)),
+  (BasicCommandRequest.OFF_CMD, 3, "turnOff", (3,)),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_ON_CMD, 1, "turnOnWifiBridgeLamp", ()),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_OFF_CMD, 1, "turnOffWifiBridgeLamp", ()),
+  (BasicCommandRequest.NIGHT_MODE_CMD, 4, "setNightMode", (4,)),
+  (BasicCommandRequest.WHITE_MODE_CMD, 4, "setWhiteMode", (4,)),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_WHITE_MODE_CMD, 1, "setWhiteModeBridgeLamp", ()),
+  (BasicCommandRequest.DISCO_MODE_SPEED_UP_CMD, 4, "speedUpDiscoMode", (4,)),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, 1, "speedUpDiscoModeBridgeLamp", ()),
+  (BasicCommandRequest.DISCO_MODE_SLOW_DOWN_CMD, 4, "slowDownDiscoMode", (4,)),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD, 1, "slowDownDiscoModeBridgeLamp", ()),
+  (BasicCommandRequest.LINK_CMD, 2, "link", (2,)),
+  (BasicCommandRequest.LINK_CMD, 3, "link", (3,)),
+  (BasicCommandRequest.UNLINK_CMD, 2, "unlink", (2,)),
+  (BasicCommandRequest.UNLINK_CMD, 3, "unlink", (3,)),
+)
+
+# Requests (command, zoneId, milight_response) sent by the command line requesting "everything" (with zone 2)
+_ALL_CMD_REQUESTS = (
+  (BasicCommandRequest.LINK_CMD, 2, True),
+  (BasicCommandRequest.UNLINK_CMD, 2, True),
+  (BasicCommandRequest.ON_CMD, 2, True),
+  (BasicCommandRequest.OFF_CMD, 2, True),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_ON_CMD, 1, True),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_OFF_CMD, 1, True),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_WHITE_MODE_CMD, 1, True),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, 1, True),
+  (BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD, 1, True),
+  (BasicCommandRequest.getColorBridgeCmd(150), 1, True),
+  (BasicCommandRequest.getBrightnessBridgeCmd(75), 1, True),
+  (BasicCommandRequest.getDiscoModeBridgeCmd(5), 1, True),
+  (BasicCommandRequest.NIGHT_MODE_CMD, 2, True),
+  (BasicCommandRequest.WHITE_MODE_CMD, 2, True),
+  (BasicCommandRequest.DISCO_MODE_SPEED_UP_CMD, 2, True),
+  (BasicCommandRequest.DISCO_MODE_SLOW_DOWN_CMD, 2, True),
+  (BasicCommandRequest.getDiscoModeCmd(5), 2, True),
+  (BasicCommandRequest.getColorCmd(150), 2, True),
+  (BasicCommandRequest.getBrightnessCmd(75), 2, True),
+  (BasicCommandRequest.getSaturationCmd(50), 2, True),
+  (BasicCommandRequest.getTemperatureCmd(25), 2, True),
+)
+
+# Command line requests with an invalid value (option, value, error message)
+_INVALID_CMD_REQUESTS = (
+  ("--setColorBridgeLamp", "700", "Color must be between 0 and 255"),
+  ("--setBrightnessBridgeLamp", "101", "Brightness must be between 0 and 100 (in %)"),
+  ("--setDiscoModeBridgeLamp", "10", "Disco mode must be between 1 and 9"),
+  ("--setDiscoMode", "10", "Disco mode must be between 1 and 9"),
+  ("--setColor", "700", "Color must be between 0 and 255"),
+  ("--setBrightness", "101", "Brightness must be between 0 and 100 (in %)"),
+  ("--setSaturation", "101", "Saturation must be between 0 and 100 (in %)"),
+  ("--setTemperature", "101", "Temperature must be between 0 and 100 (in %)"),
+)
+
 class TestMilightWifiBridge(unittest.TestCase):
   """
   Test all the MilightWifiBridge class using fake socket (MockSocket) and getting the std output (CapturingStdOut)
   """
+  # Show full difference between 2 values that we wanted to be equal
+  maxDiff = None
+
   def setUp(self):
     """
-    Get test begining timestamp (used to show time to execute test at the end)
+    Use fake socket (MockSocket) without any exchange left from a previous test
+    and save the logging configuration (changed by the command line utility)
     """
-    self.startTime = time.time()
-
-    # Show full difference between 2 values that we wanted to be equal
-    self.maxDiff = None
+    self.realSocket = socket.socket
+    socket.socket = MockSocket
+    MockSocket.initializeMock([])
+    rootLogger = logging.getLogger()
+    self.rootLogLevel = rootLogger.level
+    self.rootLogHandlers = rootLogger.handlers[:]
 
   def tearDown(self):
     """
-    Show the execution time of the test
+    Restore real socket and logging configuration
     """
-    t = time.time() - self.startTime
-    print(str(self.id())+": "+str(round(t, 2))+ " seconds")
+    socket.socket = self.realSocket
+    rootLogger = logging.getLogger()
+    rootLogger.setLevel(self.rootLogLevel)
+    rootLogger.handlers[:] = self.rootLogHandlers
 
   def test_instance(self):
-    logging.debug("test_instance")
     milight = MilightWifiBridge.MilightWifiBridge()
     self.assertNotEqual(milight, None)
 
-  @patch('socket.socket', new=MockSocket)
-  def test_close(self, new=MockSocket):
-    logging.debug("test_close")
+  def test_close(self):
     milight = MilightWifiBridge.MilightWifiBridge()
     self.assertTrue(milight.setup("127.0.0.1", 100))
     self.assertEqual(milight.close(), None)
 
-  @patch('socket.socket', new=MockSocket)
-  def test_setup(self, new=MockSocket):
-    logging.debug("test_instance")
+  def test_setup(self):
     milight = MilightWifiBridge.MilightWifiBridge()
     self.assertTrue(milight.setup("127.0.0.1", 100))
 
-  def test_socket(self, new=MockSocket):
-    logging.debug("test_socket")
+  def test_socket(self):
     # Use real socket, not Mock (to be sure the use of socket.socket is compatible between python version)
-    import socket
+    socket.socket = self.realSocket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     sock.connect(("127.0.0.1", 9461))
     sock.settimeout(0)
@@ -243,117 +471,234 @@ class TestMilightWifiBridge(unittest.TestCase):
     milight = MilightWifiBridge.MilightWifiBridge()
     self.assertTrue(milight.setup("127.0.0.1", 100))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_get_mac_address(self, new=MockSocket):
-    logging.debug("test_get_mac_address")
-
+  def test_get_mac_address(self):
+    # Second call reuses the cached session (no new start session exchange)
     MockSocket.initializeMock([
-      {'IN': bytearray([0x20,0x00,0x00,0x00,0x16,0x02,0x62,0x3a,0xd5,0xed,0xa3,0x01,0xae,
-                        0x08,0x2d,0x46,0x61,0x41,0xa7,0xf6,0xdc,0xaf,0xd3,0xe6,0x00,0x00,0x1e])},
-      {'OUT': bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x08,0x09,0x10,0x11,0x12,0x13,0x14,
-                         0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22])},
-      {'IN': bytearray([0x20,0x00,0x00,0x00,0x16,0x02,0x62,0x3a,0xd5,0xed,0xa3,0x01,0xae,
-                        0x08,0x2d,0x46,0x61,0x41,0xa7,0xf6,0xdc,0xaf,0xd3,0xe6,0x00,0x00,0x1e])},
-      {'OUT': bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x08,0x09,0x10,0x11,0x12,0x13,0x14,
-                         0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22])}
+      ('IN', _START_SESSION_IN),
+      ('OUT', _START_SESSION_OUT)
     ])
     milight = MockSocket.initializeMilight()
-    self.assertEqual(milight.getMacAddress(), "8:9:10:11:12:13")
+    self.assertEqual(milight.getMacAddress(), "08:09:10:11:12:13")
+    self.assertEqual(milight.getMacAddress(), "08:09:10:11:12:13")
+    self.assertEqual(MockSocket.pending(), [])
 
     MockSocket.initializeMock([
-      {'IN': bytearray([0x20,0x00,0x00,0x00,0x16,0x02,0x62,0x3a,0xd5,0xed,0xa3,0x01,0xae,
-                        0x08,0x2d,0x46,0x61,0x41,0xa7,0xf6,0xdc,0xaf,0xd3,0xe6,0x00,0x00,0x1e])},
-      {'OUT': bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x10,0xFF,0x12,0xF0,0xFF,0xDE,0x14,
-                         0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22])},
-      {'IN': bytearray([0x20,0x00,0x00,0x00,0x16,0x02,0x62,0x3a,0xd5,0xed,0xa3,0x01,0xae,
-                        0x08,0x2d,0x46,0x61,0x41,0xa7,0xf6,0xdc,0xaf,0xd3,0xe6,0x00,0x00,0x1e])},
-      {'OUT': bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x08,0x09,0x10,0x11,0x12,0x13,0x14,
-                         0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22])}
+      ('IN', _START_SESSION_IN),
+      ('OUT', bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x10,0xFF,0x12,0xF0,0xFF,0xDE,0x14,
+                         0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22]))
     ])
     milight = MockSocket.initializeMilight()
     self.assertEqual(milight.getMacAddress(), "10:ff:12:f0:ff:de")
+    self.assertEqual(MockSocket.pending(), [])
+
+  def test_session_cache(self):
+    # Second request reuses the session of the first one
+    milight = MockSocket.initializeMockAndMilight([BasicCommandRequest.ON_CMD, BasicCommandRequest.OFF_CMD],
+                                                  [2, 2], [True, True])
+    self.assertTrue(milight.turnOn(2))
+    self.assertTrue(milight.turnOff(2))
+    self.assertEqual(milight.getMacAddress(), "08:09:10:11:12:13")
+
+    # No ACK with cached session (and no retry in the same session): new session started and request sent again
+    milight = MockSocket.initializeMockAndMilight([BasicCommandRequest.ON_CMD, BasicCommandRequest.OFF_CMD],
+                                                  [2, 2], [True, False], retries=0)
+    milight.setup("127.0.0.1", 100, retries=0)
+    retry = bytearray([0x80,0x00,0x00,0x00,0x11,0x20,0x21,0x00,0x03,0x00]) + BasicCommandRequest.OFF_CMD + bytearray([0x02,0x00,0x41])
+    MockSocket.initializeMock(MockSocket.pending() + [
+      ('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT),
+      ('IN', retry), ('OUT', _buildAck(3))])
+    self.assertTrue(milight.turnOn(2))
+    self.assertTrue(milight.turnOff(2))
+
+    # No session caching
+    MockSocket.initializeMock([])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, session_ttl_sec=0)
+    MockSocket.initializeMock([('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT),
+                               ('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT)])
+    self.assertEqual(milight.getMacAddress(), "08:09:10:11:12:13")
+    self.assertEqual(milight.getMacAddress(), "08:09:10:11:12:13")
+    self.assertEqual(MockSocket.pending(), [])
+
+  def test_retries(self):
+    # No ACK for the first frame: same frame (same sequence number) sent again in the same session
+    milight = MockSocket.initializeMockAndMilight(BasicCommandRequest.ON_CMD, 2, False, retries=0)
+    on_request = MockSocket.pending()[-1]
+    MockSocket.initializeMock(MockSocket.pending() + [
+      on_request, ('OUT', _buildAck(1))])
+    self.assertTrue(milight.turnOn(2))
+    self.assertEqual(MockSocket.pending(), [])
+
+    # No ACK at all: frame sent "retries + 1" times, timeout doubled at each attempt
+    # and last attempt waiting for the rest of timeout_sec (total wait of timeout_sec)
+    milight = MockSocket.initializeMockAndMilight(BasicCommandRequest.ON_CMD, 2, False, retries=3)
+    milight.setup("127.0.0.1", 100, timeout_sec=5.0, retries=3, retry_timeout_sec=0.5)
+    timeoutsBefore = len(MockSocket.timeouts())
+    self.assertFalse(milight.turnOn(2))
+    self.assertEqual(MockSocket.pending(), [])
+    # First timeout used for the start session response
+    self.assertEqual(MockSocket.timeouts()[timeoutsBefore:], [0.5, 0.5, 1.0, 2.0, 1.5])
+
+    # timeout_sec spent before the last retries: no more attempt (frame sent twice)
+    milight = MockSocket.initializeMockAndMilight(BasicCommandRequest.ON_CMD, 2, False, retries=1)
+    milight.setup("127.0.0.1", 100, timeout_sec=5.0, retries=3, retry_timeout_sec=2.5)
+    timeoutsBefore = len(MockSocket.timeouts())
+    self.assertFalse(milight.turnOn(2))
+    self.assertEqual(MockSocket.pending(), [])
+    self.assertEqual(MockSocket.timeouts()[timeoutsBefore:], [2.5, 2.5, 2.5])
+
+    # Requests applied twice if sent again (link, unlink, disco mode speed up/slow down): sent once,
+    # late response still accepted during the next attempts, not sent again with a new session either
+    link_request = _buildRequest(bytes(BasicCommandRequest.LINK_CMD), 2, 2)
+    MockSocket.initializeMock([('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT),
+                               ('IN', _buildRequest(bytes(BasicCommandRequest.ON_CMD), 2, 1)), ('OUT', _buildAck(1)),
+                               ('IN', link_request)])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, retries=3)
+    self.assertTrue(milight.turnOn(2))
+    self.assertFalse(milight.link(2))
+    self.assertEqual(MockSocket.pending(), [])
+    on_request = _buildRequest(bytes(BasicCommandRequest.ON_CMD), 2, 2)
+    MockSocket.initializeMock([('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT),
+                               ('IN', _buildRequest(bytes(BasicCommandRequest.LINK_CMD), 2, 1)), ('IN', on_request),
+                               ('IN', on_request), ('OUT', _buildAck(1)), ('OUT', _buildAck(2))])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, retries=3)
+    self.assertEqual(milight.sendBatch([("link", 2), ("turnOn", 2)]), [True, True])
+    self.assertEqual(MockSocket.pending(), [])
+
+    # No retry: frame sent once with the full timeout
+    milight = MockSocket.initializeMockAndMilight(BasicCommandRequest.ON_CMD, 2, False, retries=0)
+    milight.setup("127.0.0.1", 100, timeout_sec=2.0, retries=0)
+    timeoutsBefore = len(MockSocket.timeouts())
+    self.assertFalse(milight.turnOn(2))
+    self.assertEqual(MockSocket.pending(), [])
+    self.assertEqual(MockSocket.timeouts()[timeoutsBefore:], [2.0, 2.0])
+
+    # Socket error while sending: frames sent again at the next attempt
+    on_request = _buildRequest(bytes(BasicCommandRequest.ON_CMD), 2, 1)
+    MockSocket.initializeMock([('FAIL', _START_SESSION_IN), ('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT),
+                               ('FAIL', on_request), ('IN', on_request), ('OUT', _buildAck(1))])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, retries=1)
+    self.assertTrue(milight.turnOn(2))
+    self.assertEqual(MockSocket.pending(), [])
+
+    # Socket error at every attempt: request failed and session invalidated (new session for the next request)
+    MockSocket.initializeMock([('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT), ('FAIL', on_request),
+                               ('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT),
+                               ('IN', _buildRequest(bytes(BasicCommandRequest.OFF_CMD), 2, 2)), ('OUT', _buildAck(2))])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, retries=0)
+    self.assertFalse(milight.turnOn(2, waitAck=False))
+    self.assertTrue(milight.turnOff(2))
+    self.assertEqual(MockSocket.pending(), [])
 
-  @patch('socket.socket', new=MockSocket)
-  def test_turn_on(self, new=MockSocket):
-    logging.debug("test_turn_on")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.ON_CMD, 2, True).turnOn(2))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.ON_CMD, 2, False).turnOn(2))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_turn_off(self, new=MockSocket):
-    logging.debug("test_turn_off")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.OFF_CMD, 3, True).turnOff(3))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.OFF_CMD, 3, False).turnOff(3))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_turn_on_wifi_bridge(self, new=MockSocket):
-    logging.debug("test_turn_on_wifi_bridge")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_ON_CMD, 1, True).turnOnWifiBridgeLamp())
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_ON_CMD, 1, False).turnOnWifiBridgeLamp())
-
-  @patch('socket.socket', new=MockSocket)
-  def test_turn_off_wifi_bridge(self, new=MockSocket):
-    logging.debug("test_turn_off_wifi_bridge")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_OFF_CMD, 1, True).turnOffWifiBridgeLamp())
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_OFF_CMD, 1, False).turnOffWifiBridgeLamp())
-
-  @patch('socket.socket', new=MockSocket)
-  def test_set_night_mode(self, new=MockSocket):
-    logging.debug("test_set_night_mode")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.NIGHT_MODE_CMD, 4, True).setNightMode(4))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.NIGHT_MODE_CMD, 4, False).setNightMode(4))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_set_white_mode(self, new=MockSocket):
-    logging.debug("test_set_white_mode")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.WHITE_MODE_CMD, 4, True).setWhiteMode(4))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.WHITE_MODE_CMD, 4, False).setWhiteMode(4))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_set_white_mode_bridge(self, new=MockSocket):
-    logging.debug("test_set_white_mode_bridge")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_WHITE_MODE_CMD, 1, True).setWhiteModeBridgeLamp())
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_WHITE_MODE_CMD, 1, False).setWhiteModeBridgeLamp())
-
-  @patch('socket.socket', new=MockSocket)
-  def test_speed_up_disco_mode(self, new=MockSocket):
-    logging.debug("test_speed_up_disco_mode")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.DISCO_MODE_SPEED_UP_CMD, 4, True).speedUpDiscoMode(4))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.DISCO_MODE_SPEED_UP_CMD, 4, False).speedUpDiscoMode(4))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_speed_up_disco_mode_bridge(self, new=MockSocket):
-    logging.debug("test_speed_up_disco_mode_bridge")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, 1, True).speedUpDiscoModeBridgeLamp())
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD, 1, False).speedUpDiscoModeBridgeLamp())
-
-  @patch('socket.socket', new=MockSocket)
-  def test_slow_down_disco_mode(self, new=MockSocket):
-    logging.debug("test_slow_down_disco_mode")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.DISCO_MODE_SLOW_DOWN_CMD, 4, True).slowDownDiscoMode(4))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.DISCO_MODE_SLOW_DOWN_CMD, 4, False).slowDownDiscoMode(4))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_slow_down_disco_mode_bridge(self, new=MockSocket):
-    logging.debug("test_slow_down_disco_mode_bridge")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD, 1, True).slowDownDiscoModeBridgeLamp())
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD, 1, False).slowDownDiscoModeBridgeLamp())
-
-  @patch('socket.socket', new=MockSocket)
-  def test_link(self, new=MockSocket):
-    logging.debug("test_link")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.LINK_CMD, 2, True).link(2))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.LINK_CMD, 3, False).link(3))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_unlink(self, new=MockSocket):
-    logging.debug("test_unlink")
-    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.UNLINK_CMD, 2, True).unlink(2))
-    self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.UNLINK_CMD, 3, False).unlink(3))
-
-  @patch('socket.socket', new=MockSocket)
-  def test_set_disco_mode(self, new=MockSocket):
-    logging.debug("test_set_disco_mode")
+    # No start session response at all
+    MockSocket.initializeMock([('IN', _START_SESSION_IN)] * 3)
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, retries=2, retry_timeout_sec=0.1)
+    self.assertEqual(milight.getMacAddress(), "")
+    self.assertEqual(MockSocket.pending(), [])
+
+  def test_stale_responses(self):
+    # ACKs of requests sent without waiting for them are dropped before the next start session request
+    # (no retry: each start session request must get its response at the first attempt)
+    on_request = _buildRequest(bytes(BasicCommandRequest.ON_CMD), 2, 1)
+    off_request = _buildRequest(bytes(BasicCommandRequest.OFF_CMD), 2, 2)
+    MockSocket.initializeMock([('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT), ('IN', on_request)])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, session_ttl_sec=0, retries=0)
+    self.assertTrue(milight.turnOn(2, waitAck=False))
+    MockSocket.initializeMock([('OUT', _buildAck(1)), ('OUT', _buildAck(1)),
+                               ('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT), ('IN', off_request),
+                               ('OUT', _buildAck(2)),
+                               ('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT)])
+    self.assertTrue(milight.turnOff(2, waitAck=False))
+    self.assertEqual(milight.getMacAddress(), "08:09:10:11:12:13")
+    self.assertEqual(MockSocket.pending(), [])
+
+    # ACKs already received are dropped before sending requests with a cached session
+    MockSocket.initializeMock([('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT), ('IN', on_request)])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, retries=0)
+    self.assertTrue(milight.turnOn(2, waitAck=False))
+    MockSocket.initializeMock([('OUT', _buildAck(1)), ('IN', off_request), ('OUT', _buildAck(2))])
+    self.assertTrue(milight.turnOff(2))
+    self.assertEqual(MockSocket.pending(), [])
+
+    # Unexpected frames received during an attempt are ignored (the attempt goes on)
+    MockSocket.initializeMock([('IN', _START_SESSION_IN), ('OUT', _buildAck(1)), ('OUT', _START_SESSION_OUT),
+                               ('IN', on_request), ('OUT', _buildAck(9)), ('OUT', _START_SESSION_OUT),
+                               ('OUT', _buildAck(1))])
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100, retries=0)
+    self.assertTrue(milight.turnOn(2))
+    self.assertEqual(MockSocket.pending(), [])
+
+  def test_send_batch(self):
+    # All requests sent before receiving the responses (in any order)
+    milight = MockSocket.initializeMockAndMilight([BasicCommandRequest.ON_CMD, BasicCommandRequest.getColorCmd(0xBA),
+                                                   BasicCommandRequest.getBrightnessBridgeCmd(50)],
+                                                  [2, 2, 1], [True, True, True])
+    (start_session_in, start_session_out, on_request, on_ack,
+     color_request, color_ack, brightness_request, brightness_ack) = MockSocket.pending()
+    MockSocket.initializeMock([start_session_in, start_session_out, on_request, color_request, brightness_request,
+                               color_ack, brightness_ack, on_ack])
+    self.assertEqual(milight.sendBatch([("turnOn", 2), ("unknownRequest", 2), ("setColor", 0xBA, 2), ("turnOff", 5),
+                                        ("setBrightnessBridgeLamp", 50)]),
+                     [True, False, True, False, True])
+    self.assertEqual(milight.sendBatch([]), [])
+
+    # Missing response
+    milight = MockSocket.initializeMockAndMilightBatch([(BasicCommandRequest.ON_CMD, 1, True),
+                                                       (BasicCommandRequest.OFF_CMD, 1, False)])
+    self.assertEqual(milight.sendBatch([("turnOn", 1), ("turnOff", 1)]), [True, False])
+    self.assertEqual(MockSocket.pending(), [])
+
+    # More requests than sequence numbers: sent in bursts of 255 requests (sequence numbers 1 to 255 then 1 to 45)
+    script = [('IN', _START_SESSION_IN), ('OUT', _START_SESSION_OUT)]
+    for burst in (range(1, 256), range(1, 46)):
+      script += [('IN', _buildRequest(bytes(BasicCommandRequest.ON_CMD), 1, seq_number)) for seq_number in burst]
+      script += [('OUT', _buildAck(seq_number)) for seq_number in burst]
+    MockSocket.initializeMock(script)
+    milight = MockSocket.initializeMilight()
+    milight.setup("127.0.0.1", 100)
+    self.assertEqual(milight.sendBatch([("turnOn", 1)] * 300), [True] * 300)
+    self.assertEqual(MockSocket.pending(), [])
+
+  def test_send_batch_loopback(self):
+    # Full burst of 255 requests with a real UDP socket: every ACK is received (none dropped by the kernel)
+    # so no request is sent again
+    socket.socket = self.realSocket
+    bridgeSocket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+      bridgeSocket.bind(("127.0.0.1", 0))
+      bridgeSocket.settimeout(10.0)
+      receivedFrames = []
+      bridge = threading.Thread(target=_runFakeBridge, args=(bridgeSocket, 255, receivedFrames))
+      bridge.start()
+      milight = MilightWifiBridge.MilightWifiBridge()
+      milight.setup("127.0.0.1", bridgeSocket.getsockname()[1], retry_timeout_sec=2.0)
+      try:
+        self.assertEqual(milight.sendBatch([("turnOn", 1)] * 255), [True] * 255)
+      finally:
+        milight.close()
+        bridge.join()
+    finally:
+      bridgeSocket.close()
+    self.assertEqual(len(receivedFrames), 256)
+
+  def test_simple_requests(self):
+    for command, zoneId, request, args in _SIMPLE_REQUESTS:
+      self.assertTrue(getattr(MockSocket.initializeMockAndMilight(command, zoneId, True), request)(*args), request)
+      self.assertFalse(getattr(MockSocket.initializeMockAndMilight(command, zoneId, False), request)(*args), request)
+
+    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.ON_CMD, 2, False, retries=0).turnOn(2, waitAck=False))
+    self.assertEqual(MockSocket.pending(), [])
+    self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.OFF_CMD, 3, True).turnOff(MilightWifiBridge.MilightWifiBridge.eZone.THREE))
+
+  def test_set_disco_mode(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeCmd(1), 2, True).setDiscoMode(1, 2))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeCmd(9), 3, True).setDiscoMode(9, 3))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeCmd(9), 3, True).setDiscoMode(50, 3))
@@ -361,9 +706,7 @@ class TestMilightWifiBridge(unittest.TestCase):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeCmd(1), 3, True).setDiscoMode(-454, 3))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeCmd(1), 2, False).setDiscoMode(1, 2))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_set_disco_mode_bridge(self, new=MockSocket):
-    logging.debug("test_set_disco_mode_bridge")
+  def test_set_disco_mode_bridge(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeBridgeCmd(1), 1, True).setDiscoModeBridgeLamp(1))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeBridgeCmd(9), 1, True).setDiscoModeBridgeLamp(9))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeBridgeCmd(9), 1, True).setDiscoModeBridgeLamp(50))
@@ -371,82 +714,67 @@ class TestMilightWifiBridge(unittest.TestCase):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeBridgeCmd(1), 1, True).setDiscoModeBridgeLamp(-19))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getDiscoModeBridgeCmd(1), 1, False).setDiscoModeBridgeLamp(1))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_set_color(self, new=MockSocket):
-    logging.debug("test_set_color")
+  def test_set_color(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorCmd(1), 0, True).setColor(1, 0))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorCmd(50), 3, True).setColor(50, 3))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorCmd(255), 2, True).setColor(9999, 2))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorCmd(0), 2, True).setColor(-785, 2))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorCmd(1), 2, False).setColor(1, 2))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_set_color_bridge(self, new=MockSocket):
-    logging.debug("test_set_color_bridge")
+  def test_set_color_bridge(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorBridgeCmd(1), 1, True).setColorBridgeLamp(1))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorBridgeCmd(50), 1, True).setColorBridgeLamp(50))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorBridgeCmd(255), 1, True).setColorBridgeLamp(9999))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorBridgeCmd(0), 1, True).setColorBridgeLamp(-785))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getColorBridgeCmd(1), 1, False).setColorBridgeLamp(1))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_brightness(self, new=MockSocket):
-    logging.debug("test_brightness")
+  def test_brightness(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessCmd(1), 0, True).setBrightness(1, 0))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessCmd(50), 3, True).setBrightness(50, 3))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessCmd(100), 2, True).setBrightness(15522, 2))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessCmd(0), 2, True).setBrightness(-785, 2))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessCmd(0), 2, False).setBrightness(0, 2))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_brightness_bridge(self, new=MockSocket):
-    logging.debug("test_brightness_bridge")
+  def test_brightness_bridge(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessBridgeCmd(1), 1, True).setBrightnessBridgeLamp(1))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessBridgeCmd(50), 1, True).setBrightnessBridgeLamp(50))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessBridgeCmd(100), 1, True).setBrightnessBridgeLamp(15522))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessBridgeCmd(0), 1, True).setBrightnessBridgeLamp(-785))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getBrightnessBridgeCmd(10), 1, False).setBrightnessBridgeLamp(10))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_saturation(self, new=MockSocket):
-    logging.debug("test_saturation")
+  def test_saturation(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getSaturationCmd(1), 0, True).setSaturation(1, 0))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getSaturationCmd(50), 3, True).setSaturation(50, 3))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getSaturationCmd(100), 2, True).setSaturation(15522, 2))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getSaturationCmd(0), 2, True).setSaturation(-785, 2))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getSaturationCmd(0), 2, False).setSaturation(0, 2))
 
-  @patch('socket.socket', new=MockSocket)
-  def test_temperature(self, new=MockSocket):
-    logging.debug("test_temperature")
+  def test_temperature(self):
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getTemperatureCmd(1), 0, True).setTemperature(1, 0))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getTemperatureCmd(50), 3, True).setTemperature(50, 3))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getTemperatureCmd(100), 2, True).setTemperature(15522, 2))
     self.assertTrue(MockSocket.initializeMockAndMilight(BasicCommandRequest.getTemperatureCmd(0), 2, True).setTemperature(-785, 2))
     self.assertFalse(MockSocket.initializeMockAndMilight(BasicCommandRequest.getTemperatureCmd(0), 2, False).setTemperature(0, 2))
 
-  @patch('socket.socket', new=MockSocket)
   def test_all_help_cmd(self):
-    logging.debug("test_all_help_cmd")
-
     # Request failed because nothing requested
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
         MilightWifiBridge.main((['--ip', '127.0.0.1', '--port', '1234', '--timeout', '5', '--zone', '0', '--nodebug', '--debug']))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("Debugging..." in std_output)
-    self.assertTrue("Ip: 127.0.0.1" in std_output)
-    self.assertTrue("Zone: 0" in std_output)
-    self.assertTrue("Timeout: 5" in std_output)
-    self.assertTrue("Port: 1234" in std_output)
-    self.assertTrue("[ERROR] You must call one action, use '-h' to get more information." in std_output)
+    self.assertIn("Debugging...", std_output)
+    self.assertIn("Ip: 127.0.0.1", std_output)
+    self.assertIn("Zone: 0", std_output)
+    self.assertIn("Timeout: 5", std_output)
+    self.assertIn("Port: 1234", std_output)
+    self.assertIn("[ERROR] You must call one action, use '-h' to get more information.", std_output)
 
     # Invalid parameters
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
         MilightWifiBridge.main(([]))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("[ERROR] You need to specify the ip..." in std_output)
+    self.assertIn("[ERROR] You need to specify the ip...", std_output)
 
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -457,233 +785,63 @@ class TestMilightWifiBridge(unittest.TestCase):
       with CapturingStdOut() as std_output:
         MilightWifiBridge.main(('--ip', '127.0.0.1', '--port', '-4'))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("[ERROR] You need to specify a valid port (more than 0)" in std_output)
+    self.assertIn("[ERROR] You need to specify a valid port (more than 0)", std_output)
 
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main(('--ip', '127.0.0.1', '--timeout', '-4'))
+        MilightWifiBridge.main(('--ip', '127.0.0.1', '--port', 'notAPort'))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("[ERROR] You need to specify a valid timeout (more than 0sec)" in std_output)
+    self.assertIn("[ERROR] You need to specify a valid port (more than 0)", std_output)
 
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main(('--ip', '127.0.0.1', '--zone', '-7'))
+        MilightWifiBridge.main(('--ip', '127.0.0.1', '--setColor', 'notAColor'))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("[ERROR] You need to specify a valid zone ID (between 0 and 4)" in std_output)
+    self.assertIn("[ERROR] Color must be between 0 and 255", std_output)
 
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main(('--ip', '127.0.0.1', '--zone', '7'))
+        MilightWifiBridge.main(('--ip', '127.0.0.1', '--timeout', '-4'))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("[ERROR] You need to specify a valid zone ID (between 0 and 4)" in std_output)
-
-    # Show help
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("LINK (-l, --link): Link lights to a specific zone" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "help"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "ip"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "port"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "timeout"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "zone"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "getmacaddress"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "link"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "unlink"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "turnon"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "turnoff"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "turnonwifibridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
+    self.assertIn("[ERROR] You need to specify a valid timeout (more than 0sec)", std_output)
 
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "turnoffwifibridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setnightmode"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setwhitemode"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setwhitemodebridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "speedupdiscomodebridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "slowdowndiscomodebridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "speedupdiscomode"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "slowdowndiscomode"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setcolor"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setbrightness"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setcolorbridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setbrightnessbridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
+        MilightWifiBridge.main(('--ip', '127.0.0.1', '--zone', '-7'))
+    self.assertNotEqual(cm.exception.code, 0)
+    self.assertIn("[ERROR] You need to specify a valid zone ID (between 0 and 4)", std_output)
 
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setsaturation"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
+        MilightWifiBridge.main(('--ip', '127.0.0.1', '--zone', '7'))
+    self.assertNotEqual(cm.exception.code, 0)
+    self.assertIn("[ERROR] You need to specify a valid zone ID (between 0 and 4)", std_output)
 
+    # Show help
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "settemperature"]))
+        MilightWifiBridge.main((["--help"]))
     self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
+    self.assertIn("LINK (-l, --link): Link lights to a specific zone", std_output)
 
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setdiscomode"]))
+        MilightWifiBridge.main((["--help", "unknownFunction"]))
     self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
+    self.assertIn("LINK (-l, --link): Link lights to a specific zone", std_output)
 
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((["--help", "setdiscomodebridgelamp"]))
-    self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Usage:" in std_output)
+    # Same capture for all the topics (only the output of the current topic checked)
+    with CapturingStdOut():
+      for topic in _HELP_TOPICS:
+        start = sys.stdout.tell()
+        with self.assertRaises(SystemExit) as cm:
+          MilightWifiBridge.main((["--help", topic]))
+        self.assertEqual(cm.exception.code, 0, topic)
+        self.assertIn("Usage:", sys.stdout.getvalue()[start:].splitlines(), topic)
 
-  @patch('socket.socket', new=MockSocket)
   def test_all_cmd_request_except_help_cmd(self):
-    logging.debug("test_all_cmd_request_except_help_cmd")
-
-    # Request to do "everything" from cmd (except get mac address)
-    MockSocket.initializeMockAndMilight([
-                                           BasicCommandRequest.LINK_CMD,
-                                           BasicCommandRequest.UNLINK_CMD,
-                                           BasicCommandRequest.ON_CMD,
-                                           BasicCommandRequest.OFF_CMD,
-                                           BasicCommandRequest.WIFI_BRIDGE_LAMP_ON_CMD,
-                                           BasicCommandRequest.WIFI_BRIDGE_LAMP_OFF_CMD,
-                                           BasicCommandRequest.WIFI_BRIDGE_LAMP_WHITE_MODE_CMD,
-                                           BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SPEED_UP_CMD,
-                                           BasicCommandRequest.WIFI_BRIDGE_LAMP_DISCO_MODE_SLOW_DOWN_CMD,
-                                           BasicCommandRequest.getColorBridgeCmd(150),
-                                           BasicCommandRequest.getBrightnessBridgeCmd(75),
-                                           BasicCommandRequest.getDiscoModeBridgeCmd(5),
-                                           BasicCommandRequest.NIGHT_MODE_CMD,
-                                           BasicCommandRequest.WHITE_MODE_CMD,
-                                           BasicCommandRequest.DISCO_MODE_SPEED_UP_CMD,
-                                           BasicCommandRequest.DISCO_MODE_SLOW_DOWN_CMD,
-                                           BasicCommandRequest.getDiscoModeCmd(5),
-                                           BasicCommandRequest.getColorCmd(150),
-                                           BasicCommandRequest.getBrightnessCmd(75),
-                                           BasicCommandRequest.getSaturationCmd(50),
-                                           BasicCommandRequest.getTemperatureCmd(25),
-                                         ],
-                                         [
-                                           2, 2, 2, 2,
-                                           1, 1, 1, 1, 1, 1, 1, 1,
-                                           2, 2, 2, 2, 2, 2, 2, 2, 2,
-                                         ],
-                                         [
-                                           True, True, True, True,
-                                           True, True, True, True, True, True, True, True,
-                                           True, True, True, True, True, True, True, True, True,
-                                         ])
+    # Request to do "everything" from cmd (except get mac address), requests sent one after the other
+    MockSocket.initializeMockAndMilightBatch(_ALL_CMD_REQUESTS, batch=False)
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
         MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
@@ -710,38 +868,40 @@ class TestMilightWifiBridge(unittest.TestCase):
                                  '--setTemperature', '25',
                                 ]))
     self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Ip: 127.0.0.1" in std_output)
-    self.assertTrue("Zone: 2" in std_output)
-    self.assertTrue("Timeout: 5.0" in std_output)
-    self.assertTrue("Port: 5987" in std_output)
-    self.assertTrue("Link zone 2: True" in std_output)
-    self.assertTrue("Unlink zone 2: True" in std_output)
-    self.assertTrue('Turn on zone 2: True' in std_output)
-    self.assertTrue('Turn off zone 2: True' in std_output)
-    self.assertTrue('Turn on wifi bridge lamp: True' in std_output)
-    self.assertTrue('Turn off wifi bridge lamp: True' in std_output)
-    self.assertTrue('Set white mode to wifi bridge: True' in std_output)
-    self.assertTrue('Speed up disco mode to wifi bridge: True' in std_output)
-    self.assertTrue('Slow down disco mode to wifi bridge: True' in std_output)
-    self.assertTrue('Set color 150 to wifi bridge: True' in std_output)
-    self.assertTrue('Set brightness 75% to the wifi bridge: True' in std_output)
-    self.assertTrue('Set disco mode 5 to wifi bridge: True' in std_output)
-    self.assertTrue('Set night mode to zone 2: True' in std_output)
-    self.assertTrue('Set white mode to zone 2: True' in std_output)
-    self.assertTrue('Speed up disco mode to zone 2: True' in std_output)
-    self.assertTrue('Slow down disco mode to zone 2: True' in std_output)
-    self.assertTrue('Set disco mode 5 to zone 2: True' in std_output)
-    self.assertTrue('Set color 150 to zone 2: True' in std_output)
-    self.assertTrue('Set brightness 75% to zone 2: True' in std_output)
-    self.assertTrue('Set saturation 50% to zone 2: True' in std_output)
-    self.assertTrue('Set temperature 25% to zone 2: True' in std_output)
+    outputLines = set(std_output)
+    missingLines = [line for line in (
+      "Ip: 127.0.0.1",
+      "Zone: 2",
+      "Timeout: 5.0",
+      "Port: 5987",
+      "Link zone 2: True",
+      "Unlink zone 2: True",
+      "Turn on zone 2: True",
+      "Turn off zone 2: True",
+      "Turn on wifi bridge lamp: True",
+      "Turn off wifi bridge lamp: True",
+      "Set white mode to wifi bridge: True",
+      "Speed up disco mode to wifi bridge: True",
+      "Slow down disco mode to wifi bridge: True",
+      "Set color 150 to wifi bridge: True",
+      "Set brightness 75% to the wifi bridge: True",
+      "Set disco mode 5 to wifi bridge: True",
+      "Set night mode to zone 2: True",
+      "Set white mode to zone 2: True",
+      "Speed up disco mode to zone 2: True",
+      "Slow down disco mode to zone 2: True",
+      "Set disco mode 5 to zone 2: True",
+      "Set color 150 to zone 2: True",
+      "Set brightness 75% to zone 2: True",
+      "Set saturation 50% to zone 2: True",
+      "Set temperature 25% to zone 2: True",
+    ) if line not in outputLines]
+    self.assertEqual(missingLines, [])
 
     # Get mac address from cmd
     MockSocket.initializeMock([
-      {'IN': bytearray([0x20,0x00,0x00,0x00,0x16,0x02,0x62,0x3a,0xd5,0xed,0xa3,0x01,0xae,
-                        0x08,0x2d,0x46,0x61,0x41,0xa7,0xf6,0xdc,0xaf,0xd3,0xe6,0x00,0x00,0x1e])},
-      {'OUT': bytearray([0x01,0x02,0x03,0x04,0x05,0x06,0x07,0x08,0x09,0x10,0x11,0x12,0x13,0x14,
-                         0x15,0x16,0x17,0x18,0x19,0x20,0x21,0x22])},
+      ('IN', _START_SESSION_IN),
+      ('OUT', _START_SESSION_OUT),
     ])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
@@ -749,28 +909,21 @@ class TestMilightWifiBridge(unittest.TestCase):
                                  '--getMacAddress',
                                 ]))
     self.assertEqual(cm.exception.code, 0)
-    self.assertTrue("Mac address: 8:9:10:11:12:13" in std_output)
+    self.assertIn("Mac address: 08:09:10:11:12:13", std_output)
 
-    MockSocket.initializeMock([])
+    # No start session response (request sent again 3 times)
+    MockSocket.initializeMock([('IN', _START_SESSION_IN)] * 4)
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
         MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1',
                                  '--getMacAddress',
                                 ]))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("Failed to get mac address" in std_output)
-
-    # Error returned by the device
-    MockSocket.initializeMockAndMilight([
-                                           BasicCommandRequest.LINK_CMD,
-                                           BasicCommandRequest.UNLINK_CMD,
-                                         ],
-                                         [
-                                           2, 2
-                                         ],
-                                         [
-                                           True, False
-                                         ])
+    self.assertIn("Failed to get mac address", std_output)
+
+    # Error returned by the device (unlink never sent again, next requests not sent)
+    MockSocket.initializeMockAndMilight([BasicCommandRequest.LINK_CMD, BasicCommandRequest.UNLINK_CMD],
+                                        [2, 2], [True, False])
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
         MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
@@ -779,76 +932,55 @@ class TestMilightWifiBridge(unittest.TestCase):
                                  '--turnOn',
                                 ]))
     self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue("Link zone 2: True" in std_output)
-    self.assertTrue("Unlink zone 2: False" in std_output)
-    self.assertTrue("[ERROR] Request failed" in std_output)
-
-    # Invalid input
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setColorBridgeLamp', '700',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Color must be between 0 and 255' in std_output)
+    self.assertIn("Link zone 2: True", std_output)
+    self.assertIn("Unlink zone 2: False", std_output)
+    self.assertNotIn("Turn on zone 2", std_output)
+    self.assertIn("[ERROR] Request failed", std_output)
+    self.assertEqual(MockSocket.pending(), [])
 
+    # Short options (-l is link and -z is zone, not debug/nodebug)
+    MockSocket.initializeMockAndMilight(BasicCommandRequest.LINK_CMD, 2, True)
     with self.assertRaises(SystemExit) as cm:
       with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setBrightnessBridgeLamp', '101',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Brightness must be between 0 and 100 (in %)' in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setDiscoModeBridgeLamp', '10',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Disco mode must be between 1 and 9' in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setDiscoMode', '10',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Disco mode must be between 1 and 9' in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setColor', '700',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Color must be between 0 and 255' in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setBrightness', '101',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Brightness must be between 0 and 100 (in %)' in std_output)
-
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setSaturation', '101',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Saturation must be between 0 and 100 (in %)' in std_output)
+        MilightWifiBridge.main((['-i', '127.0.0.1', '-z', '2', '-l']))
+    self.assertEqual(cm.exception.code, 0)
+    self.assertIn("Zone: 2", std_output)
+    self.assertIn("Link zone 2: True", std_output)
+    self.assertNotIn("Debugging...", std_output)
 
-    with self.assertRaises(SystemExit) as cm:
-      with CapturingStdOut() as std_output:
-        MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2',
-                                 '--setTemperature', '101',
-                                ]))
-    self.assertNotEqual(cm.exception.code, 0)
-    self.assertTrue('[ERROR] Temperature must be between 0 and 100 (in %)' in std_output)
+    # Invalid input
+    for option, value, error in _INVALID_CMD_REQUESTS:
+      with self.assertRaises(SystemExit) as cm:
+        with CapturingStdOut() as std_output:
+          MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2', option, value]))
+      self.assertNotEqual(cm.exception.code, 0, option)
+      self.assertIn('[ERROR] ' + error, std_output)
+
+  def test_cmd_debug_logs(self):
+    # Logs of the MilightWifiBridge class (setup included) shown with "--debug"
+    # (logging configured by main() with a new handler writing to the captured stderr,
+    #  logging configuration restored by tearDown())
+    del logging.getLogger().handlers[:]
+    stderr = sys.stderr
+    sys.stderr = StringIO()
+    try:
+      MockSocket.initializeMockAndMilight(BasicCommandRequest.LINK_CMD, 2, True)
+      with self.assertRaises(SystemExit) as cm:
+        with CapturingStdOut():
+          MilightWifiBridge.main((['--debug', '--ip', '127.0.0.1', '--zone', '2', '--link']))
+      logs = sys.stderr.getvalue()
+    finally:
+      sys.stderr = stderr
+    self.assertEqual(cm.exception.code, 0)
+    # Only the root logger level is set (the MilightWifiBridge class logger inherits it)
+    self.assertEqual(logging.getLogger(MilightWifiBridge.__name__).level, logging.NOTSET)
+    self.assertIn("UDP connection initialized with ip 127.0.0.1 and port 5987", logs)
+    # Command line requests sent with the public methods (not in a batch)
+    self.assertIn("Link zone 2: True", logs)
+    self.assertNotIn("Send batch", logs)
 
 if __name__ == '__main__':
   logger = logging.getLogger()
-  logger.setLevel(logging.DEBUG)
+  # Library debug logs only shown on request (MILIGHT_TEST_VERBOSE environment variable set)
+  logger.setLevel(logging.DEBUG if os.environ.get("MILIGHT_TEST_VERBOSE") else logging.WARNING)
   unittest.main()